@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime
+
+from api_request import get_balance_async, get_quota_async, run_concurrently
+from auth_helper import AuthInstance
+from ui import render_table
+from util import clear_screen, pause
+from profiling import profiled
+
+# Maksimal akun yang di-fetch bersamaan
+MAX_CONCURRENT_ACCOUNTS = 3
+
+
+async def _fetch_account(api_key, number, semaphore):
+    async with semaphore:
+        try:
+            # Token dari cache per akun, refresh hanya kalau sudah habis
+            tokens = await asyncio.to_thread(AuthInstance.get_tokens, number)
+            if not tokens:
+                return {"number": number, "error": "Token tidak valid"}
+            balance, quota = await asyncio.gather(
+                get_balance_async(api_key, tokens["id_token"]),
+                get_quota_async(api_key, tokens["id_token"]),
+            )
+        except Exception as e:
+            return {"number": number, "error": str(e)}
+    return {"number": number, "balance": balance, "quota": quota}
+
+
+async def _fetch_all(api_key, numbers):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ACCOUNTS)
+    return await asyncio.gather(*[_fetch_account(api_key, number, semaphore) for number in numbers])
+
+
+def fetch_account_overview():
+    """Balance & quota semua akun tersimpan, di-fetch bersamaan. Tidak mengganti akun aktif."""
+    numbers = [rt["number"] for rt in AuthInstance.refresh_tokens]
+    if not numbers:
+        return []
+    return run_concurrently(_fetch_all(AuthInstance.api_key, numbers))[0]
+
+
+def _overview_row(idx, result):
+    active_user = AuthInstance.active_user
+    marker = " (Aktif)" if active_user and active_user["number"] == result["number"] else ""
+    number = result["number"] + marker
+
+    if "error" in result:
+        return [str(idx), number, "-", "-", f"Gagal: {result['error']}"]
+
+    balance = result.get("balance") or {}
+    expired_ts = balance.get("expired_at")
+    expired_at = datetime.fromtimestamp(expired_ts).strftime("%Y-%m-%d") if expired_ts else "N/A"
+
+    quota = result.get("quota")
+    if quota:
+        display_quota = f"{quota['remaining'] / 1e9:.2f}/{quota['total'] / 1e9:.2f} GB"
+        if quota.get("has_unlimited"):
+            display_quota += " Unlimited"
+    else:
+        display_quota = "N/A"
+
+    return [str(idx), number, f"Rp {balance.get('remaining', 'N/A')}", expired_at, display_quota]
+
+
+@profiled("account_overview")
+def show_account_overview(interactive=True):
+    """Ringkasan read-only semua akun dalam satu tabel."""
+    if interactive:
+        clear_screen()
+    print("Fetching account overview...")
+    results = fetch_account_overview()
+
+    if interactive:
+        clear_screen()
+    if not results:
+        render_table("RINGKASAN AKUN", [["-", "Tidak ada akun tersimpan"]],
+                     headers=["No", "Nomor HP"], aligns=["center", "left"], style="red")
+    else:
+        rows = [_overview_row(idx, result) for idx, result in enumerate(results, start=1)]
+        render_table("RINGKASAN AKUN", rows,
+                     headers=["No", "Nomor HP", "Pulsa", "Masa Aktif", "Kuota"],
+                     aligns=["center", "left", "left", "center", "left"], style="cyan")
+
+    if interactive:
+        pause()
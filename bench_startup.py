@@ -0,0 +1,103 @@
+"""
+Benchmark waktu startup: import main.py (tanpa menjalankan menu) di proses Python baru,
+memakai `python -X importtime`, lalu laporkan waktu import per modul.
+
+Usage:
+    python bench_startup.py [--runs 5] [--top 20] [--budget-ms 500]
+
+Jalan di direktori sementara berisi api.key dummy supaya tidak ada prompt dan
+tidak menyentuh file akun asli. Exit code 1 kalau median startup melebihi budget.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from dotenv import dotenv_values
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Target waktu import main.py di device low-end
+STARTUP_BUDGET_MS = 500
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def run_once(workdir: str):
+    """Return (wall_ms, {module: (self_us, cumulative_us)}) untuk satu proses."""
+    # load_dotenv() di main.py mencari .env dari cwd saat dijalankan via -c
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    env.update({k: v for k, v in dotenv_values(os.path.join(REPO_DIR, ".env")).items() if v is not None})
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=workdir,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us))
+    return wall_ms, modules
+
+
+def repo_modules():
+    return {name[:-3] for name in os.listdir(REPO_DIR) if name.endswith(".py")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup-time benchmark for main.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "api.key"), "w", encoding="utf8") as f:
+            f.write("bench")
+
+        # Run pertama hanya untuk compile __pycache__
+        run_once(workdir)
+        runs = [run_once(workdir) for _ in range(args.runs)]
+
+    walls = [wall for wall, _ in runs]
+    names = set().union(*(modules.keys() for _, modules in runs))
+    medians = {}
+    for name in names:
+        samples = [modules[name] for _, modules in runs if name in modules]
+        medians[name] = (
+            statistics.median(s[0] for s in samples) / 1000,
+            statistics.median(s[1] for s in samples) / 1000,
+        )
+
+    own = repo_modules()
+    print(f"{'module':<40} {'self ms':>10} {'cumul ms':>10}")
+    print("-" * 62)
+    ranked = sorted(medians.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_ms, cumulative_ms) in ranked[:args.top]:
+        marker = " *" if name in own else ""
+        print(f"{name + marker:<40} {self_ms:>10.1f} {cumulative_ms:>10.1f}")
+    print("(* = modul repo ini)")
+
+    median_wall = statistics.median(walls)
+    print()
+    print(f"startup wall time: median {median_wall:.0f} ms, min {min(walls):.0f} ms, max {max(walls):.0f} ms ({args.runs} runs)")
+    print(f"budget: {args.budget_ms:.0f} ms -> {'OK' if median_wall <= args.budget_ms else 'OVER BUDGET'}")
+    return 0 if median_wall <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
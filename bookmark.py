@@ -2,33 +2,24 @@
 import os
 import json
 import shutil
-import io
-import sys
-import banner
 import textwrap
+import hashlib
 from typing import List, Dict
 from auth_helper import AuthInstance
 from package import show_package_details
 
-from util import clear_screen, pause
-from paket_xut import get_family  # atau sesuaikan import get_family sesuai struktur proyek
+from util import pause
+from screen import ScreenInstance
+from api_request import get_family, get_cached_family
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.table import Table
 from rich import box
+from profiling import profiled
 
 console = Console()
 
-def show_banner():
-    term_width = shutil.get_terminal_size().columns
-    buffer = io.StringIO()
-    sys.stdout = buffer
-    ascii_art.to_terminal(columns=60)
-    sys.stdout = sys.__stdout__
-    banner_lines = [line.center(term_width) for line in buffer.getvalue().splitlines()]
-    console.print("\n".join(banner_lines), style="bold blue")
-
 # ======================
 # Singleton Bookmark
 # ======================
@@ -45,14 +36,20 @@ class Bookmark:
         if not self._initialized:
             self.packages: List[Dict] = []
             self.filepath = "bookmark.json"
-
-            if os.path.exists(self.filepath):
-                self.load_bookmark()
-            else:
-                self._save([])  # create empty file
+            self._loaded = False
 
             self._initialized = True
 
+    def _ensure_loaded(self):
+        # File bookmark baru dibaca saat pertama kali dipakai, bukan saat import
+        if self._loaded:
+            return
+        self._loaded = True
+        if os.path.exists(self.filepath):
+            self.load_bookmark()
+        else:
+            self._save([])  # create empty file
+
     def _save(self, data: List[Dict]):
         with open(self.filepath, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=4)
@@ -63,6 +60,12 @@ class Bookmark:
             if "family_name" not in p:
                 p["family_name"] = ""
                 updated = True
+            if "option_code" not in p:
+                p["option_code"] = ""
+                updated = True
+            if "family_hash" not in p:
+                p["family_hash"] = ""
+                updated = True
         if updated:
             self.save_bookmark()
 
@@ -81,7 +84,9 @@ class Bookmark:
         is_enterprise: bool,
         variant_name: str,
         option_name: str,
+        option_code: str = "",
     ) -> bool:
+        self._ensure_loaded()
         key = (family_code, variant_name, option_name)
         if any(
             (p["family_code"], p["variant_name"], p["option_name"]) == key
@@ -97,6 +102,8 @@ class Bookmark:
                 "is_enterprise": is_enterprise,
                 "variant_name": variant_name,
                 "option_name": option_name,
+                "option_code": option_code,
+                "family_hash": "",
             }
         )
         self.save_bookmark()
@@ -110,6 +117,7 @@ class Bookmark:
         variant_name: str,
         option_name: str,
     ) -> bool:
+        self._ensure_loaded()
         for i, p in enumerate(self.packages):
             if (
                 p["family_code"] == family_code
@@ -124,75 +132,147 @@ class Bookmark:
         console.print(Panel("Bookmark not found.", style="red"))
         return False
 
+    def set_resolved_option(
+        self,
+        family_code: str,
+        is_enterprise: bool,
+        variant_name: str,
+        option_name: str,
+        option_code: str,
+        family_hash: str,
+    ):
+        self._ensure_loaded()
+        for p in self.packages:
+            if (
+                p["family_code"] == family_code
+                and p["is_enterprise"] == is_enterprise
+                and p["variant_name"] == variant_name
+                and p["option_name"] == option_name
+            ):
+                if p.get("option_code") != option_code or p.get("family_hash") != family_hash:
+                    p["option_code"] = option_code
+                    p["family_hash"] = family_hash
+                    self.save_bookmark()
+                return
+
     def get_bookmarks(self) -> List[Dict]:
+        self._ensure_loaded()
         return self.packages.copy()
 
 
+def family_content_hash(family_data: Dict) -> str:
+    """Hash isi family yang relevan untuk bookmark (nama variant/opsi & kode opsi)."""
+    h = hashlib.sha256()
+    for variant in family_data.get("package_variants", []):
+        for option in variant.get("package_options", []):
+            h.update(f"{variant.get('name')}\x00{option.get('name')}\x00{option.get('package_option_code')}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def find_option_code(family_data: Dict, variant_name: str, option_name: str):
+    for variant in family_data["package_variants"]:
+        if variant["name"] == variant_name:
+            for option in variant["package_options"]:
+                if option["name"] == option_name:
+                    return option["package_option_code"]
+    return None
+
+
+def resolve_bookmark_option(api_key: str, tokens: Dict, bm: Dict):
+    """
+    Cari package_option_code untuk bookmark.
+    Pakai option_code tersimpan hanya kalau hash family dari cache masih sama.
+    Kalau family tidak ada di cache, fetch dulu untuk cek hash-nya.
+    Return option_code, atau None kalau paket tidak ada di family.
+    """
+    family_code = bm["family_code"]
+    is_enterprise = bm["is_enterprise"]
+    option_code = bm.get("option_code")
+
+    family_data = get_cached_family(api_key, tokens, family_code, is_enterprise)
+    if family_data is None:
+        family_data = get_family(api_key, tokens, family_code, is_enterprise)
+        if not family_data:
+            return None
+
+    family_hash = family_content_hash(family_data)
+    if option_code and family_hash == bm.get("family_hash"):
+        return option_code
+
+    option_code = find_option_code(family_data, bm["variant_name"], bm["option_name"])
+    if option_code:
+        BookmarkInstance.set_resolved_option(
+            family_code, is_enterprise, bm["variant_name"], bm["option_name"], option_code, family_hash
+        )
+    return option_code
+
+
 BookmarkInstance = Bookmark()
 
 # ======================
 # Menu Bookmark
 # ======================
 
+@profiled("bookmarks")
 def show_bookmark_menu():
     api_key = AuthInstance.api_key
     tokens = AuthInstance.get_active_tokens()
 
     in_bookmark_menu = True
     while in_bookmark_menu:
-        clear_screen()
-
         bookmarks = BookmarkInstance.get_bookmarks()
 
         if not bookmarks:
-            console.print(
-                Panel("Tidak ada bookmark tersimpan.", style="red", expand=True, padding=(1, 2))
-            )
+            with ScreenInstance.frame() as frame:
+                frame.print(
+                    Panel("Tidak ada bookmark tersimpan.", style="red", expand=True, padding=(1, 2))
+                )
             pause()
             return None
 
-        # ======================
-        # Tabel Bookmark (judul jadi bagian tabel)
-        # ======================
-        bookmark_table = Table(
-            title="[bold cyan]📚 Bookmark[/bold cyan]",
-            title_justify="center",
-            show_header=True,
-            header_style="bold white on blue",
-            expand=True,
-            box=box.ROUNDED,
-        )
-        bookmark_table.add_column("No", justify="center", style="bold cyan", width=6)
-        bookmark_table.add_column("📦 Paket", style="green")
-        bookmark_table.add_column("📂 Family", style="yellow")
-
-        for idx, bm in enumerate(bookmarks, start=1):
-            bookmark_table.add_row(
-                str(idx),
-                f"{bm['variant_name']} - {bm['option_name']}",
-                bm.get("family_name", "-")
+        with ScreenInstance.frame() as frame:
+            # ======================
+            # Tabel Bookmark (judul jadi bagian tabel)
+            # ======================
+            bookmark_table = Table(
+                title="[bold cyan]📚 Bookmark[/bold cyan]",
+                title_justify="center",
+                show_header=True,
+                header_style="bold white on blue",
+                expand=True,
+                box=box.ROUNDED,
             )
+            bookmark_table.add_column("No", justify="center", style="bold cyan", width=6)
+            bookmark_table.add_column("📦 Paket", style="green")
+            bookmark_table.add_column("📂 Family", style="yellow")
+
+            for idx, bm in enumerate(bookmarks, start=1):
+                bookmark_table.add_row(
+                    str(idx),
+                    f"{bm['variant_name']} - {bm['option_name']}",
+                    bm.get("family_name", "-")
+                )
 
-        console.print(bookmark_table)
-
-        # ======================
-        # Tabel Command
-        # ======================
-        command_table = Table(
-            title="[bold cyan]⚙ Command[/bold cyan]",
-            title_justify="center",
-            show_header=True,
-            header_style="bold white on blue",
-            expand=True,
-            box=box.ROUNDED,
-        )
-        command_table.add_column("No", justify="center", style="bold cyan", width=6)
-        command_table.add_column("Perintah", style="bold")
+            frame.print(bookmark_table)
+
+            # ======================
+            # Tabel Command
+            # ======================
+            command_table = Table(
+                title="[bold cyan]⚙ Command[/bold cyan]",
+                title_justify="center",
+                show_header=True,
+                header_style="bold white on blue",
+                expand=True,
+                box=box.ROUNDED,
+            )
+            command_table.add_column("No", justify="center", style="bold cyan", width=6)
+            command_table.add_column("Perintah", style="bold")
 
-        command_table.add_row("0", "🔙 Kembali ke menu utama")
-        command_table.add_row("00", "❌ Hapus Bookmark")
+            command_table.add_row("0", "🔙 Kembali ke menu utama")
+            command_table.add_row("00", "❌ Hapus Bookmark")
 
-        console.print(command_table)
+            frame.print(command_table)
 
         # ======================
         # Input
@@ -219,23 +299,10 @@ def show_bookmark_menu():
 
         if choice.isdigit() and 1 <= int(choice) <= len(bookmarks):
             selected_bm = bookmarks[int(choice) - 1]
-            family_code = selected_bm["family_code"]
             is_enterprise = selected_bm["is_enterprise"]
 
-            family_data = get_family(api_key, tokens, family_code, is_enterprise)
-            if not family_data:
-                console.print(Panel("Gagal mengambil data family.", style="red"))
-                pause()
-                continue
-
-            # Cari kode opsi paket
-            option_code = None
-            for variant in family_data["package_variants"]:
-                if variant["name"] == selected_bm["variant_name"]:
-                    for option in variant["package_options"]:
-                        if option["name"] == selected_bm["option_name"]:
-                            option_code = option["package_option_code"]
-                            break
+            # Kode opsi paket (dari index bookmark, fetch family hanya kalau perlu)
+            option_code = resolve_bookmark_option(api_key, tokens, selected_bm)
             if option_code:
                 show_package_details(api_key, tokens, option_code, is_enterprise)
             else:
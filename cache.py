@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache in-memory dengan umur (TTL) per entry dan batas ukuran (LRU).
+    Aman dipakai dari beberapa thread sekaligus.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        # Format: {key: (stored_at, value)}, urutan = paling lama dipakai duluan
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Field detail paket yang berubah tiap request dan wajib fresh saat bayar.
+# Tidak pernah disimpan di cache.
+VOLATILE_PACKAGE_FIELDS = ("token_confirmation", "timestamp", "fetched_at")
+
+# Detail paket hasil get_package, key: package_option_code
+package_cache = TTLCache(ttl=300, maxsize=64)
+
+# Hasil get_addons, key: package_option_code
+addons_cache = TTLCache(ttl=600, maxsize=64)
+
+# Hasil get_family, key: (family_code, is_enterprise)
+family_cache = TTLCache(ttl=600, maxsize=32)
+
+# Hasil display_html, key: (sha1 html, width). Key berbasis isi, jadi TTL cukup panjang
+html_text_cache = TTLCache(ttl=3600, maxsize=64)
+
+
+def strip_volatile(package: dict) -> dict:
+    return {k: v for k, v in package.items() if k not in VOLATILE_PACKAGE_FIELDS}
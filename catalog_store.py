@@ -0,0 +1,153 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+def family_display_fields(data: dict) -> dict:
+    """Ambil field get_family yang dipakai untuk render menu saja."""
+    family = data.get("package_family", {})
+    return {
+        "package_family": {
+            "name": family.get("name", ""),
+            "package_family_code": family.get("package_family_code", ""),
+        },
+        "package_variants": [
+            {
+                "name": variant.get("name", ""),
+                "package_options": [
+                    {
+                        "name": option.get("name", ""),
+                        "price": option.get("price", 0),
+                        "package_option_code": option.get("package_option_code", ""),
+                    }
+                    for option in variant.get("package_options", [])
+                ],
+            }
+            for variant in data.get("package_variants", [])
+        ],
+    }
+
+
+def package_display_fields(data: dict) -> dict:
+    """Ambil field get_package yang dipakai show_package_details (tanpa token pembayaran)."""
+    family = data.get("package_family", {})
+    option = data.get("package_option", {})
+    return {
+        "package_family": {
+            "name": family.get("name", ""),
+            "package_family_code": family.get("package_family_code", ""),
+            "payment_for": family.get("payment_for", ""),
+        },
+        "package_detail_variant": {
+            "name": data.get("package_detail_variant", {}).get("name", ""),
+        },
+        "package_option": {
+            "package_option_code": option.get("package_option_code", ""),
+            "name": option.get("name", ""),
+            "price": option.get("price", 0),
+            "validity": option.get("validity", ""),
+            "benefits": option.get("benefits", []),
+            "tnc": option.get("tnc", ""),
+        },
+    }
+
+
+class CatalogStore:
+    """
+    Cache katalog di disk (SQLite), disimpan di samping family_code.json & bookmark.json.
+    Menyimpan field tampilan hasil get_family/get_package beserta waktu fetch,
+    supaya menu bisa langsung render setelah restart.
+    """
+    _instance_ = None
+    _initialized_ = False
+
+    filepath = "catalog_cache.db"
+    # Data disk lebih tua dari ini tidak ditampilkan lagi, caller fetch ulang (blocking)
+    max_age = 24 * 60 * 60
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance_:
+            cls._instance_ = super().__new__(cls)
+        return cls._instance_
+
+    def __init__(self):
+        if not self._initialized_:
+            self._lock = threading.Lock()
+            self._conn = None
+
+            self._initialized_ = True
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.filepath, check_same_thread=False)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS families (
+                    family_code TEXT NOT NULL,
+                    is_enterprise INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (family_code, is_enterprise)
+                );
+                CREATE TABLE IF NOT EXISTS packages (
+                    package_option_code TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                );
+                """
+            )
+        return self._conn
+
+    def _get(self, query: str, params: tuple):
+        try:
+            with self._lock:
+                row = self._connect().execute(query, params).fetchone()
+        except sqlite3.Error as e:
+            print(f"[catalog cache] {e}")
+            return None
+        if not row:
+            return None
+        return {"data": json.loads(row[0]), "fetched_at": row[1]}
+
+    def _put(self, query: str, params: tuple):
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(query, params)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"[catalog cache] {e}")
+
+    def is_expired(self, stored: dict) -> bool:
+        return time.time() - stored["fetched_at"] > self.max_age
+
+    def get_family(self, family_code: str, is_enterprise: bool):
+        """Return {"data": dict, "fetched_at": float} atau None."""
+        return self._get(
+            "SELECT data, fetched_at FROM families WHERE family_code = ? AND is_enterprise = ?",
+            (family_code, int(is_enterprise)),
+        )
+
+    def save_family(self, family_code: str, is_enterprise: bool, data: dict):
+        self._put(
+            "INSERT OR REPLACE INTO families VALUES (?, ?, ?, ?)",
+            (family_code, int(is_enterprise), json.dumps(family_display_fields(data)), time.time()),
+        )
+
+    def get_package(self, package_option_code: str):
+        """Return {"data": dict, "fetched_at": float} atau None."""
+        return self._get(
+            "SELECT data, fetched_at FROM packages WHERE package_option_code = ?",
+            (package_option_code,),
+        )
+
+    def save_package(self, package_option_code: str, data: dict):
+        self._put(
+            "INSERT OR REPLACE INTO packages VALUES (?, ?, ?)",
+            (package_option_code, json.dumps(package_display_fields(data)), time.time()),
+        )
+
+
+# Singleton instance
+CatalogStoreInstance = CatalogStore()
@@ -1,10 +1,12 @@
-import os, hmac, hashlib, requests, brotli, zlib, base64
+import os, hmac, hashlib, brotli, zlib, base64
 from random import randint
 from datetime import datetime, timezone, timedelta
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad
 from dataclasses import dataclass
 
+from transport import TransportInstance
+
 API_KEY = os.getenv("API_KEY")
 
 XDATA_DECRYPT_URL = "https://crypto.mashu.lol/api/decrypt"
@@ -12,6 +14,15 @@ XDATA_ENCRYPT_SIGN_URL = "https://crypto.mashu.lol/api/encryptsign"
 PAYMENT_SIGN_URL = "https://crypto.mashu.lol/api/sign-payment"
 BOUNTY_SIGN_URL = "https://crypto.mashu.lol/api/sign-bounty"
 AX_SIGN_URL = "https://crypto.mashu.lol/api/sign-ax"
+# Layanan crypto hanya mengolah data tanpa efek samping, jadi semua request-nya aman di-retry
+
+
+class CryptoServiceError(Exception):
+    """Respon non-200 dari layanan crypto (encryptsign, decrypt, signature)."""
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 AES_KEY_ASCII = os.getenv("AES_KEY_ASCII")
 BLOCK = AES.block_size
@@ -131,11 +142,11 @@ def ax_api_signature(
         "contact_type": contact_type
     }
     
-    response = requests.request("POST", AX_SIGN_URL, json=request_body, headers=headers, timeout=30)
+    response = TransportInstance.post(AX_SIGN_URL, json=request_body, headers=headers, timeout=30, retry=True)
     if response.status_code == 200:
         return response.json().get("ax_signature")
     else:
-        raise Exception(f"Signature generation failed: {response.text}")
+        raise CryptoServiceError(f"Signature generation failed: {response.text}", response.status_code)
     
 def encryptsign_xdata(
         api_key: str,
@@ -156,12 +167,12 @@ def encryptsign_xdata(
         "body": payload
     }
 
-    response = requests.request("POST", XDATA_ENCRYPT_SIGN_URL, json=request_body, headers=headers, timeout=30)
+    response = TransportInstance.post(XDATA_ENCRYPT_SIGN_URL, json=request_body, headers=headers, timeout=30, retry=True)
     
     if response.status_code == 200:
         return response.json()
     else:
-        raise Exception(f"Encryption failed: {response.text}")
+        raise CryptoServiceError(f"Encryption failed: {response.text}", response.status_code)
     
 def decrypt_xdata(
     api_key: str,
@@ -175,12 +186,12 @@ def decrypt_xdata(
         "x-api-key": api_key,
     }
     
-    response = requests.request("POST", XDATA_DECRYPT_URL, json=encrypted_payload, headers=headers, timeout=30)
+    response = TransportInstance.post(XDATA_DECRYPT_URL, json=encrypted_payload, headers=headers, timeout=30, retry=True)
     
     if response.status_code == 200:
         return response.json().get("plaintext")
     else:
-        raise Exception(f"Decryption failed: {response.text}")
+        raise CryptoServiceError(f"Decryption failed: {response.text}", response.status_code)
 
 def get_x_signature_payment(
         api_key: str,
@@ -203,12 +214,12 @@ def get_x_signature_payment(
         "payment_method": payment_method
     }
     
-    response = requests.request("POST", PAYMENT_SIGN_URL, json=request_body, headers=headers, timeout=30)
+    response = TransportInstance.post(PAYMENT_SIGN_URL, json=request_body, headers=headers, timeout=30, retry=True)
     
     if response.status_code == 200:
         return response.json().get("x_signature")
     else:
-        raise Exception(f"Signature generation failed: {response.text}")
+        raise CryptoServiceError(f"Signature generation failed: {response.text}", response.status_code)
     
 def get_x_signature_bounty(
         api_key: str,
@@ -229,9 +240,9 @@ def get_x_signature_bounty(
         "token_payment": token_payment
     }
     
-    response = requests.request("POST", BOUNTY_SIGN_URL, json=request_body, headers=headers, timeout=30)
+    response = TransportInstance.post(BOUNTY_SIGN_URL, json=request_body, headers=headers, timeout=30, retry=True)
     if response.status_code == 200:
         return response.json().get("x_signature")
     else:
-        raise Exception(f"Signature generation failed: {response.text}")
+        raise CryptoServiceError(f"Signature generation failed: {response.text}", response.status_code)
     
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+
+from api_request import get_balance_async, get_quota_async, run_concurrently
+
+
+class Dashboard:
+    """
+    Data header menu utama (balance & quota) per nomor.
+    Keduanya di-fetch bersamaan, disimpan dengan TTL pendek, dan diperbarui
+    thread background supaya redraw menu tidak menunggu jaringan.
+    """
+    _instance_ = None
+    _initialized_ = False
+
+    ttl = 30
+    refresh_interval = 60
+    snapshot_file = "dashboard_snapshot.json"
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance_:
+            cls._instance_ = super().__new__(cls)
+        return cls._instance_
+
+    def __init__(self):
+        if not self._initialized_:
+            self.entries = {}
+            # Format: {"number": {"balance": dict, "quota": dict, "fetched_at": float}}
+            self._lock = threading.Lock()
+            self._refreshing = set()
+            self._context = None
+            # Format: (api_key, {"number": str, "tokens": dict}) user aktif terakhir
+            self._thread = None
+            self._stop = threading.Event()
+
+            self._initialized_ = True
+
+    def fetch(self, api_key: str, active_user: dict) -> dict:
+        """Fetch balance & quota bersamaan lalu simpan ke cache."""
+        tokens = active_user["tokens"]
+        balance, quota = run_concurrently(
+            get_balance_async(api_key, tokens["id_token"]),
+            get_quota_async(api_key, tokens["id_token"]),
+        )
+        entry = {
+            "balance": balance,
+            "quota": quota,
+            "fetched_at": time.time(),
+        }
+        with self._lock:
+            previous = self.entries.get(active_user["number"], {})
+            # Pertahankan data lama kalau salah satu fetch gagal
+            for key in ("balance", "quota"):
+                if entry[key] is None:
+                    entry[key] = previous.get(key)
+            self.entries[active_user["number"]] = entry
+        if entry["balance"] is not None:
+            self.save_snapshot(active_user["number"], entry)
+        return entry
+
+    def save_snapshot(self, number: str, entry: dict):
+        """Simpan dashboard terakhir ke disk untuk ditampilkan saat cold start."""
+        snapshot = {
+            "number": number,
+            "balance": entry["balance"],
+            "quota": entry["quota"],
+            "fetched_at": entry["fetched_at"],
+        }
+        tmp_path = self.snapshot_file + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=4)
+            os.replace(tmp_path, self.snapshot_file)
+        except OSError as e:
+            print(f"Failed to save dashboard snapshot: {e}")
+
+    def load_snapshot(self):
+        """Return snapshot dashboard terakhir dari disk, atau None."""
+        if not os.path.exists(self.snapshot_file):
+            return None
+        try:
+            with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or "number" not in snapshot:
+            return None
+        return snapshot
+
+    def get(self, api_key: str, active_user: dict) -> dict:
+        """
+        Data dashboard untuk user aktif.
+        Hanya blok ke jaringan kalau belum ada data sama sekali,
+        data yang sudah lewat TTL di-refresh di background.
+        """
+        self._context = (api_key, active_user)
+        with self._lock:
+            entry = self.entries.get(active_user["number"])
+        if entry is None:
+            return self.fetch(api_key, active_user)
+        if time.time() - entry["fetched_at"] > self.ttl:
+            self.refresh_in_background(api_key, active_user)
+        return entry
+
+    def invalidate(self, number: str):
+        with self._lock:
+            self.entries.pop(str(number), None)
+
+    def refresh_in_background(self, api_key: str, active_user: dict):
+        number = active_user["number"]
+        with self._lock:
+            if number in self._refreshing:
+                return
+            self._refreshing.add(number)
+
+        def run():
+            try:
+                self.fetch(api_key, active_user)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(number)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def start_auto_refresh(self):
+        """Refresh data user aktif terakhir tiap refresh_interval detik."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop.wait(self.refresh_interval):
+                if self._context:
+                    self.refresh_in_background(*self._context)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, daemon=True)
+        self._thread.start()
+
+
+# Singleton instance
+DashboardInstance = Dashboard()
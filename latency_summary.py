@@ -0,0 +1,45 @@
+from tracing import TracerInstance, PERCENTILES
+from ui import render_table
+from util import clear_screen, pause
+
+# Urutan hop dalam satu panggilan API
+HOP_ORDER = ("encryptsign", "sign", "api", "decrypt")
+
+
+def _hop_rows(hops: dict) -> list:
+    names = [name for name in HOP_ORDER if name in hops]
+    names += sorted(name for name in hops if name.split(".")[0] not in HOP_ORDER)
+    rows = []
+    for name in names:
+        for label in (name, f"{name}.connect"):
+            if label in hops:
+                rows.append([f"  └ {label}", "", *(f"{hops[label][p]:.0f}" for p in PERCENTILES)])
+    return rows
+
+
+def show_latency_summary(interactive=True):
+    """Ringkasan latensi p50/p95/p99 per endpoint dari file trace."""
+    if interactive:
+        clear_screen()
+    summary = TracerInstance.summary()
+
+    headers = ["Endpoint / Hop", "Jumlah (error)", *(f"p{p} ms" for p in PERCENTILES)]
+    aligns = ["left", "center", "right", "right", "right"]
+    if not summary:
+        render_table("LATENSI API", [["Belum ada data trace", "-", "-", "-", "-"]],
+                     headers=headers, aligns=aligns, style="red")
+    else:
+        rows = []
+        # Endpoint paling lambat (p95) di atas
+        for path, entry in sorted(summary.items(), key=lambda item: item[1]["total"][95], reverse=True):
+            rows.append([
+                path,
+                f"{entry['count']} ({entry['errors']})",
+                *(f"{entry['total'][p]:.0f}" for p in PERCENTILES),
+            ])
+            rows.extend(_hop_rows(entry["hops"]))
+        render_table("LATENSI API", rows, headers=headers, aligns=aligns, style="cyan")
+        print(f"Sumber: {TracerInstance.trace_file}")
+
+    if interactive:
+        pause()
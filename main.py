@@ -4,7 +4,11 @@ load_dotenv()
 import sys
 import os
 import json
+import select
 import shutil
+import threading
+
+import requests
 
 from ui import *
 from api_request import *
@@ -12,12 +16,17 @@ from paket_xut import get_package_xut
 from my_package import fetch_my_packages
 from paket_custom_family import get_packages_by_family
 from auth_helper import AuthInstance
+from dashboard import DashboardInstance
+from account_overview import show_account_overview
+from latency_summary import show_latency_summary
+import table
 
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.text import Text
+from profiling import profiled, ProfilerInstance
+from transport import RequestCancelled, DeadlineExceeded
 
 console = Console()
 
@@ -32,40 +41,18 @@ def get_terminal_width(default=90):
         return default
 
 
-def render_rich_table(title, rows, headers=None, col_aligns=None, style="cyan", show_header=True):
-    """
-    Render tabel menggunakan Rich dengan warna dan opsional header.
-    """
-    table = Table(
-        title=f"[bold {style}]{title}[/bold {style}]",
-        show_lines=True,
-        expand=True,
-        show_header=show_header,
-        border_style=style
-    )
-
-    n_cols = len(headers) if headers else (len(rows[0]) if rows else 1)
-    for i in range(n_cols):
-        justify = col_aligns[i] if col_aligns and i < len(col_aligns) else "left"
-        col_title = headers[i] if headers and i < len(headers) else f"Col{i+1}"
-        table.add_column(col_title, justify=justify, style=style)
-
-    for row in rows:
-        table.add_row(*[str(cell) for cell in row])
-
-    console.print(table)
-
-
 def render_commands_table(rows, title="COMMANDS", style="magenta"):
     """
     Tabel commands khusus Rich tanpa header
     """
-    render_rich_table(title, rows, headers=["No", "Description"], col_aligns=["center", "left"], style=style, show_header=False)
+    table.render_table(title, rows, headers=["No", "Description"], aligns=["center", "left"], style=style,
+                       show_header=False, show_lines=True, text_style=style, static=True)
 
 
 # -----------------------------
 # Auth / Login
 # -----------------------------
+@profiled("login")
 def login_flow():
     selected_user_number = show_account_menu()
     if selected_user_number:
@@ -118,6 +105,7 @@ def delete_family_code(family_list, number_mapping):
     pause()
 
 
+@profiled("family_code_menu")
 def family_code_menu():
     json_file = "family_code.json"
     if not os.path.exists(json_file):
@@ -138,12 +126,12 @@ def family_code_menu():
 
         # Render NORMAL table
         normal_table = build_table(normal_codes, 1) if normal_codes else [[ "-", "-", "Tidak ada normal family code"]]
-        render_rich_table("NORMAL FAMILY CODES", normal_table, headers=["No","Name","Code"], col_aligns=["center","left","left"], style="blue")
+        table.render_table("NORMAL FAMILY CODES", normal_table, headers=["No","Name","Code"], aligns=["center","left","left"], style="blue", show_lines=True, text_style="blue")
 
         # Render ENTERPRISE table
         enterprise_start_index = len(normal_codes)+1
         enterprise_table = build_table(enterprise_codes, enterprise_start_index) if enterprise_codes else [["-","-","Tidak ada enterprise family code"]]
-        render_rich_table("ENTERPRISE FAMILY CODES", enterprise_table, headers=["No","Name","Code"], col_aligns=["center","left","left"], style="cyan")
+        table.render_table("ENTERPRISE FAMILY CODES", enterprise_table, headers=["No","Name","Code"], aligns=["center","left","left"], style="cyan", show_lines=True, text_style="cyan")
 
         # Global mapping nomor -> family code
         number_mapping = {str(i): fc for i, fc in enumerate(normal_codes + enterprise_codes, start=1)}
@@ -178,62 +166,169 @@ def family_code_menu():
 # -----------------------------
 # Main Menu
 # -----------------------------
+@profiled("main_menu")
+def render_dashboard(number, dashboard, stale=False):
+    balance = dashboard.get("balance") or {}
+    balance_remaining = balance.get("remaining",0)
+    balance_expired_at = balance.get("expired_at","N/A")
+
+    quota = dashboard.get("quota") or {}
+    remaining = quota.get("remaining",0)
+    total = quota.get("total",0)
+    has_unlimited = quota.get("has_unlimited",False)
+
+    remaining_gb = remaining/1e9
+    total_gb = total/1e9
+    display_quota = f"{remaining_gb:.2f}/{total_gb:.2f} GB Unlimited" if has_unlimited else f"{remaining_gb:.2f}/{total_gb:.2f} GB"
+
+    stale_since = dashboard.get("fetched_at") if stale else None
+    show_main_menu(number, balance_remaining, balance_expired_at, display_quota=display_quota, stale_since=stale_since)
+
+
+def ask_with_redraw(prompt, redraw_event, redraw):
+    """
+    Seperti Prompt.ask, tapi selama menunggu input layar digambar ulang
+    (di thread ini) setiap kali redraw_event di-set thread lain.
+    """
+    if os.name == "nt":
+        # select() di Windows tidak bisa untuk stdin; layar diperbarui di loop menu berikutnya
+        return Prompt.ask(prompt)
+    console.print(f"{prompt}: ", end="")
+    while True:
+        ready, _, _ = select.select([sys.stdin], [], [], 0.2)
+        if ready:
+            line = sys.stdin.readline()
+            if not line:
+                raise EOFError
+            return line.rstrip("\n")
+        if redraw_event.is_set():
+            redraw_event.clear()
+            redraw()
+            console.print(f"{prompt}: ", end="")
+
+
+def warm_start_menu(snapshot):
+    """
+    Cold start: tampilkan dashboard terakhir dari disk (ditandai stale),
+    login & fetch data jalan di background, lalu thread utama menggambar ulang menu.
+    Return pilihan menu user.
+    """
+    render_dashboard(snapshot["number"], snapshot, stale=True)
+    refreshed = threading.Event()
+    fresh = {}
+
+    def refresh():
+        # Hanya ambil data & beri sinyal; menggambar layar dan input tetap di thread utama
+        active_user = AuthInstance.get_active_user_background()
+        if not active_user:
+            return
+        try:
+            fresh["dashboard"] = DashboardInstance.fetch(AuthInstance.api_key, active_user)
+        except Exception:
+            return
+        fresh["number"] = active_user["number"]
+        refreshed.set()
+
+    threading.Thread(target=refresh, daemon=True).start()
+    return ask_with_redraw(
+        "Pilih menu", refreshed,
+        lambda: render_dashboard(fresh["number"], fresh["dashboard"]),
+    ).strip()
+
+
+def handle_menu_choice(choice):
+    """Jalankan menu sesuai pilihan. Return False kalau user keluar aplikasi."""
+    if choice=="1":
+        login_flow()
+    elif choice=="2":
+        fetch_my_packages()
+    elif choice=="3":
+        packages = get_package_xut()
+        show_package_menu(packages)
+    elif choice=="4":
+        family_code = Prompt.ask("Enter family code (or '99' to cancel)").strip()
+        if family_code!="99":
+            get_packages_by_family(family_code)
+    elif choice=="5":
+        family_code = Prompt.ask("Enter family code (or '99' to cancel)").strip()
+        if family_code!="99":
+            get_packages_by_family(family_code,is_enterprise=True)
+    elif choice=="6":
+        family_code_menu()
+    elif choice == "7":  
+        show_bookmark_menu()
+    elif choice == "8":
+        show_settings_menu()
+    elif choice == "9":
+        show_account_overview()
+    elif choice == "10":
+        show_latency_summary()
+    elif choice=="99":
+        console.print("[green]Exiting the application.[/green]")
+        return False
+    else:
+        console.print("[red]Pilihan tidak valid. Silakan coba lagi.[/red]")
+        pause()
+    return True
+
+
 def main():
+    AuthInstance.start_login()
+    DashboardInstance.start_auto_refresh()
+
+    # Snapshot hanya valid untuk akun yang sedang login di background (akun pertama)
+    snapshot = DashboardInstance.load_snapshot()
+    if not (snapshot and not AuthInstance.is_ready() and snapshot["number"] == AuthInstance.refresh_tokens[0]["number"]):
+        snapshot = None
+
     while True:
-        active_user = AuthInstance.get_active_user()
-        if active_user: None
-            balance = os_getenv(AuthInstance.api_key, active_user["tokens"]["id_token"]) or {}
-            balance_remaining = os_getenv("remaining",0)
-            balance_expired_at = os_getenv("expired_at","N/A")
-
-            quota = os_getenv(AuthInstance.api_key, active_user["tokens"]["id_token"]) or {}
-            remaining = os_getenv("remaining",0)
-            total = os_getenv("total",0)
-            has_unlimited = os_getenv("has_unlimited",False)
-
-            remaining_gb = remaining/1e9
-            total_gb = total/1e9
-            display_quota = f"{remaining_gb:.2f}/{total_gb:.2f} GB Unlimited" if has_unlimited else f"{remaining_gb:.2f}/{total_gb:.2f} GB"
-
-            show_main_menu(active_user["number"], balance_remaining, balance_expired_at, display_quota=display_quota)
-
-            choice = Prompt.ask("Pilih menu").strip()
-            if choice=="1":
-                login_flow()
-            elif choice=="2":
-                fetch_my_packages()
-            elif choice=="3":
-                packages = get_package_xut()
-                show_package_menu(packages)
-            elif choice=="4":
-                family_code = Prompt.ask("Enter family code (or '99' to cancel)").strip()
-                if family_code!="99":
-                    get_packages_by_family(family_code)
-            elif choice=="5":
-                family_code = Prompt.ask("Enter family code (or '99' to cancel)").strip()
-                if family_code!="99":
-                    get_packages_by_family(family_code,is_enterprise=True)
-            elif choice=="6":
-                family_code_menu()
-            elif choice == "7":  
-                show_bookmark_menu()
-            elif choice == "8":
-                show_settings_menu()
-                continue
-            elif choice=="99":
-                console.print("[green]Exiting the application.[/green]")
-                return
+        # Ctrl+C di prompt menu utama tetap keluar aplikasi; Ctrl+C saat request
+        # berjalan (RequestCancelled) hanya membatalkan aksi itu dan kembali ke menu
+        try:
+            if snapshot:
+                # Pilihan pertama dari menu warm start, lewat jalur error yang sama dengan loop
+                choice = warm_start_menu(snapshot)
+                snapshot = None
             else:
-                console.print("[red]Pilihan tidak valid. Silakan coba lagi.[/red]")
-                pause()
-        else:
-            login_flow()
+                active_user = AuthInstance.get_active_user()
+                if not active_user:
+                    login_flow()
+                    continue
+                # Balance & quota dari cache dashboard (refresh di background)
+                dashboard = DashboardInstance.get(AuthInstance.api_key, active_user)
+                render_dashboard(active_user["number"], dashboard)
+                choice = Prompt.ask("Pilih menu").strip()
+
+            if not handle_menu_choice(choice):
+                return
+        except RequestCancelled:
+            console.print("\n[yellow]Request dibatalkan.[/yellow]")
+            pause()
+        except DeadlineExceeded:
+            console.print("\n[red]Request timeout, silakan coba lagi.[/red]")
+            pause()
+        except requests.RequestException as e:
+            # Termasuk CircuitOpen: server sedang down, gagal cepat tanpa menunggu timeout
+            console.print(f"\n[red]Gagal terhubung ke server: {e}[/red]")
+            pause()
 
 
 if __name__=="__main__":
+    if "--profile" in sys.argv:
+        # python main.py --profile : profil CPU & memori per aksi menu, ringkasan dicetak saat keluar
+        ProfilerInstance.enable()
     try:
-        main()
+        if "--overview" in sys.argv:
+            # python main.py --overview : cetak ringkasan semua akun lalu keluar
+            show_account_overview(interactive=False)
+        elif "--latency" in sys.argv:
+            # python main.py --latency : cetak ringkasan latensi API dari file trace lalu keluar
+            show_latency_summary(interactive=False)
+        else:
+            main()
     except KeyboardInterrupt:
         console.print("\n[red]Exiting the application.[/red]")
     except Exception as e:
         console.print(f"[red]An error occurred: {e}[/red]")
+    finally:
+        ProfilerInstance.print_summary()
@@ -1,4 +1,5 @@
-from api_request import get_package, send_api_request
+import asyncio
+from api_request import get_package_async, send_api_request, run_concurrently
 from auth_helper import AuthInstance
 from datetime import datetime
 from rich.console import Console
@@ -6,9 +7,70 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from ui import show_package_details
 from util import clear_screen, pause
+from profiling import profiled
 
 console = Console()
 
+MAX_CONCURRENT_LOOKUPS = 5
+
+def render_quota_panel(num, quota, package_details):
+    quota_code = quota.get("quota_code", "N/A")
+    name = quota.get("name", "N/A")
+    expired_ts = quota.get("active_date", 0)
+    expired_dt = datetime.fromtimestamp(expired_ts).strftime("%Y-%m-%d %H:%M:%S") if expired_ts else "N/A"
+
+    benefits = quota.get("benefits", [])
+    if benefits:
+        main_benefit = benefits[0]
+        remaining = main_benefit.get("remaining", 0)
+        total = main_benefit.get("total", 0)
+        is_unlimited = main_benefit.get("is_unlimited", False)
+    else:
+        remaining = total = 0
+        is_unlimited = False
+
+    remaining_gb = remaining / 1e9
+    total_gb = total / 1e9
+    display_quota = f"{remaining_gb:.2f}/{total_gb:.2f} GB"
+    if is_unlimited:
+        display_quota += " Unlimited"
+
+    # Ambil family_code jika tersedia
+    family_code = "N/A"
+    if package_details:
+        family_code = package_details.get("package_family", {}).get("package_family_code", "N/A")
+
+    # Buat panel vertikal
+    panel_content = f"[cyan]No:[/cyan] {num}\n"
+    panel_content += f"[green]Name:[/green] {name}\n"
+    panel_content += f"[yellow]Quota:[/yellow] {display_quota}\n"
+    panel_content += f"[magenta]Expired At:[/magenta] {expired_dt}\n"
+    panel_content += f"[blue]Quota Code:[/blue] {quota_code}\n"
+    panel_content += f"[white]Family Code:[/white] {family_code}"
+
+    console.print(Panel(panel_content, expand=True, border_style="bright_blue"))
+
+async def _resolve_packages(api_key, tokens, entries):
+    """
+    Ambil detail paket tiap quota secara bersamaan (maks MAX_CONCURRENT_LOOKUPS).
+    Hasil get_package masuk package_cache, jadi buka detail setelahnya tidak fetch ulang.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+    async def lookup(entry):
+        async with semaphore:
+            try:
+                details = await get_package_async(api_key, tokens, entry["quota_code"])
+            except Exception as e:
+                console.print(f"[red]Failed to fetch package {entry['number']}: {e}[/red]")
+                details = None
+        return entry, details
+
+    for next_done in asyncio.as_completed([lookup(entry) for entry in entries]):
+        entry, details = await next_done
+        render_quota_panel(entry["number"], entry["quota"], details)
+
+@profiled("my_packages")
 def fetch_my_packages():
     api_key = AuthInstance.api_key
     tokens = AuthInstance.get_active_tokens()
@@ -32,50 +94,13 @@ def fetch_my_packages():
     quotas = res["data"]["quotas"]
     clear_screen()
 
-    my_packages = []
-    num = 1
-
-    # Tampilkan setiap paket sebagai panel vertikal
-    for quota in quotas:
-        quota_code = quota.get("quota_code", "N/A")
-        name = quota.get("name", "N/A")
-        expired_ts = quota.get("active_date", 0)
-        expired_dt = datetime.fromtimestamp(expired_ts).strftime("%Y-%m-%d %H:%M:%S") if expired_ts else "N/A"
-
-        benefits = quota.get("benefits", [])
-        if benefits:
-            main_benefit = benefits[0]
-            remaining = main_benefit.get("remaining", 0)
-            total = main_benefit.get("total", 0)
-            is_unlimited = main_benefit.get("is_unlimited", False)
-        else:
-            remaining = total = 0
-            is_unlimited = False
-
-        remaining_gb = remaining / 1e9
-        total_gb = total / 1e9
-        display_quota = f"{remaining_gb:.2f}/{total_gb:.2f} GB"
-        if is_unlimited:
-            display_quota += " Unlimited"
-
-        # Ambil family_code jika tersedia
-        family_code = "N/A"
-        package_details = get_package(api_key, tokens, quota_code)
-        if package_details:
-            family_code = package_details.get("package_family", {}).get("package_family_code", "N/A")
-
-        # Buat panel vertikal
-        panel_content = f"[cyan]No:[/cyan] {num}\n"
-        panel_content += f"[green]Name:[/green] {name}\n"
-        panel_content += f"[yellow]Quota:[/yellow] {display_quota}\n"
-        panel_content += f"[magenta]Expired At:[/magenta] {expired_dt}\n"
-        panel_content += f"[blue]Quota Code:[/blue] {quota_code}\n"
-        panel_content += f"[white]Family Code:[/white] {family_code}"
-
-        console.print(Panel(panel_content, expand=True, border_style="bright_blue"))
-
-        my_packages.append({"number": num, "quota_code": quota_code})
-        num += 1
+    my_packages = [
+        {"number": num, "quota_code": quota.get("quota_code", "N/A"), "quota": quota}
+        for num, quota in enumerate(quotas, start=1)
+    ]
+
+    # Lookup family_code jalan bersamaan, panel tampil begitu lookup-nya selesai
+    run_concurrently(_resolve_packages(api_key, tokens, my_packages))
 
     # Interaksi memilih paket
     while True:
@@ -3,119 +3,160 @@ from rich.console import Console
 from rich.panel import Panel
 
 from table import render_table
-from util import clear_screen, pause, display_html, format_unit
-from api_request import get_package, get_addons, purchase_package
+from util import pause, display_html, format_unit
+from screen import ScreenInstance
+from api_request import get_package, get_package_async, get_addons_async, purchase_package, run_concurrently, payment_token_fresh
 from purchase_api import show_multipayment, show_qris_payment, settlement_bounty
+from profiling import profiled
 
 console = Console()
 
 
+def ensure_payment_token(api_key, tokens, package_option_code, package):
+    """
+    Data paket dengan token_confirmation yang masih valid untuk bayar.
+    Fetch ulang hanya kalau package belum punya token atau token-nya sudah kedaluwarsa.
+    """
+    if payment_token_fresh(package):
+        return package
+    fresh = get_package(api_key, tokens, package_option_code)
+    if not fresh:
+        raise ValueError("Failed to refresh payment token.")
+    return fresh
+
+
+async def _addons_or_error(api_key, tokens, package_option_code, use_cache):
+    # Gagal ambil addons tidak boleh menggagalkan detail paket
+    try:
+        return await get_addons_async(api_key, tokens, package_option_code, use_cache=use_cache)
+    except Exception as e:
+        return e
+
+
+def fetch_package_screen(api_key, tokens, package_option_code, refresh=False):
+    """
+    Detail paket & addons di-fetch bersamaan, sekali per kunjungan layar.
+    Return (package, addons), addons berisi Exception kalau fetch addons gagal.
+    """
+    print("Fetching package...")
+    return run_concurrently(
+        get_package_async(api_key, tokens, package_option_code, use_cache=not refresh),
+        _addons_or_error(api_key, tokens, package_option_code, not refresh),
+    )
+
+
+@profiled("package_details")
 def show_package_details(api_key, tokens, package_option_code, is_enterprise=False):
     """
     Tampilkan detail paket, addons, syarat & ketentuan, serta menu pembayaran.
     Digunakan baik dari ui.py maupun bookmark.py
     """
+    # Data paket (dari cache kalau masih valid) dipakai ulang selama di layar ini,
+    # token pembayaran diambil fresh saat bayar
+    package, addons = fetch_package_screen(api_key, tokens, package_option_code)
     while True:   # loop utama
-        clear_screen()
-
-        # Ambil data paket
-        package = get_package(api_key, tokens, package_option_code)
         if not package:
-            console.print("Failed to load package details.", style="bold red")
+            with ScreenInstance.frame() as frame:
+                frame.print("Failed to load package details.", style="bold red")
             pause()
             return None   # jangan sys.exit
 
-        # Info dasar
-        family_name = package.get("package_family", {}).get("name", "")
-        variant_name = package.get("package_detail_variant", {}).get("name", "")
-        option_name = package.get("package_option", {}).get("name", "")
-
-        title = f"{family_name} {variant_name} {option_name}".strip()
-        price = package["package_option"]["price"]
-        validity = package["package_option"]["validity"]
-        benefits = package["package_option"]["benefits"]
-        detail = display_html(package["package_option"]["tnc"])
-
-        # DETAIL PAKET
-        package_table = [
-            ["📦 Nama Paket", title],
-            ["💰 Harga", f"Rp {price}"],
-            ["⏳ Masa Aktif", validity]
-        ]
-        render_table("DETAIL PAKET", package_table, headers=None,
-                     aligns=["left", "left"], style="cyan")
-
-        # BENEFITS
-        if benefits:
-            benefit_table = [[f"✅ {b['name']}", format_unit(b["total"], b["name"])]
-                             for b in benefits]
-            render_table("BENEFITS", benefit_table, headers=None,
-                         aligns=["left", "left"], style="magenta")
-
-        # ADDONS
-        try:
-            addons = get_addons(api_key, tokens, package_option_code)
-            addons_list = []
-            if isinstance(addons, dict):
-                addons_list = addons.get("addons") or addons.get("data") or []
-            elif isinstance(addons, list):
-                addons_list = addons
-
-            if addons_list:
-                rows = []
-                for addon in addons_list:
-                    if isinstance(addon, dict):
-                        name = addon.get("name", "-")
-                        info = addon.get("information", "")
-                        validity = addon.get("validity", "-")
-                        price = f"Rp {addon.get('price', 0)}"
-                        rows.append([name, info, validity, price])
-                    else:
-                        rows.append([str(addon), "-", "-", "-"])
-                render_table("ADDONS", rows,
-                             headers=["Nama", "Keterangan", "Masa Aktif", "Harga"],
-                             aligns=["left", "left", "center", "right"],
-                             style="yellow")
+        with ScreenInstance.frame() as frame:
+            # Info dasar
+            family_name = package.get("package_family", {}).get("name", "")
+            variant_name = package.get("package_detail_variant", {}).get("name", "")
+            option_name = package.get("package_option", {}).get("name", "")
+
+            title = f"{family_name} {variant_name} {option_name}".strip()
+            price = package["package_option"]["price"]
+            validity = package["package_option"]["validity"]
+            benefits = package["package_option"]["benefits"]
+            detail = display_html(package["package_option"]["tnc"])
+
+            # DETAIL PAKET
+            package_table = [
+                ["📦 Nama Paket", title],
+                ["💰 Harga", f"Rp {price}"],
+                ["⏳ Masa Aktif", validity]
+            ]
+            render_table("DETAIL PAKET", package_table, headers=None,
+                         aligns=["left", "left"], style="cyan", console=frame)
+
+            # BENEFITS
+            if benefits:
+                benefit_table = [[f"✅ {b['name']}", format_unit(b["total"], b["name"])]
+                                 for b in benefits]
+                render_table("BENEFITS", benefit_table, headers=None,
+                             aligns=["left", "left"], style="magenta", console=frame)
+
+            # ADDONS
+            try:
+                if isinstance(addons, Exception):
+                    raise addons
+                addons_list = []
+                if isinstance(addons, dict):
+                    addons_list = addons.get("addons") or addons.get("data") or []
+                elif isinstance(addons, list):
+                    addons_list = addons
+
+                if addons_list:
+                    rows = []
+                    for addon in addons_list:
+                        if isinstance(addon, dict):
+                            name = addon.get("name", "-")
+                            info = addon.get("information", "")
+                            addon_validity = addon.get("validity", "-")
+                            addon_price = f"Rp {addon.get('price', 0)}"
+                            rows.append([name, info, addon_validity, addon_price])
+                        else:
+                            rows.append([str(addon), "-", "-", "-"])
+                    render_table("ADDONS", rows,
+                                 headers=["Nama", "Keterangan", "Masa Aktif", "Harga"],
+                                 aligns=["left", "left", "center", "right"],
+                                 style="yellow", console=frame)
+                else:
+                    json_str = json.dumps(addons, indent=2, ensure_ascii=False)
+                    render_table("ADDONS", [[json_str]],
+                                 headers=None, aligns=["left"], style="yellow", console=frame)
+            except Exception as e:
+                frame.print(f"Fetching addons failed: {e}", style="bold red")
+
+            # SYARAT & KETENTUAN
+            if detail:
+                detail_clean = "\n".join([line.strip()
+                                         for line in detail.splitlines() if line.strip()])
+                render_table("SYARAT & KETENTUAN", [[detail_clean]],
+                             headers=None, aligns=["left"], style="yellow", console=frame)
             else:
-                json_str = json.dumps(addons, indent=2, ensure_ascii=False)
-                render_table("ADDONS", [[json_str]],
-                             headers=None, aligns=["left"], style="yellow")
-        except Exception as e:
-            console.print(f"Fetching addons failed: {e}", style="bold red")
-
-        # SYARAT & KETENTUAN
-        if detail:
-            detail_clean = "\n".join([line.strip()
-                                     for line in detail.splitlines() if line.strip()])
-            render_table("SYARAT & KETENTUAN", [[detail_clean]],
-                         headers=None, aligns=["left"], style="yellow")
-        else:
-            console.print("Tidak ada syarat & ketentuan.", style="bold yellow")
-
-        # MENU PEMBAYARAN
-        payment_for = package["package_family"]["payment_for"]
-        payment_methods = [
-            ["1", "💰 Beli dengan Pulsa"],
-            ["2", "💳 Beli dengan E-Wallet"],
-            ["3", "🔲 Bayar dengan QRIS"],
-            ["0", "📑 Bookmark Paket"],
-            ["00", "🔙 Kembali ke Menu"],
-        ]
-        if payment_for == "REDEEM_VOUCHER":
-            payment_methods.append(["4", "🎁 Ambil sebagai bonus (jika tersedia)"])
-
-        render_table("METODE PEMBAYARAN", payment_methods,
-                     headers=None, aligns=["center", "left"], style="blue")
+                frame.print("Tidak ada syarat & ketentuan.", style="bold yellow")
+
+            # MENU PEMBAYARAN
+            payment_for = package["package_family"]["payment_for"]
+            payment_methods = [
+                ["1", "💰 Beli dengan Pulsa"],
+                ["2", "💳 Beli dengan E-Wallet"],
+                ["3", "🔲 Bayar dengan QRIS"],
+                ["0", "📑 Bookmark Paket"],
+                ["R", "🔄 Refresh Detail Paket"],
+                ["00", "🔙 Kembali ke Menu"],
+            ]
+            if payment_for == "REDEEM_VOUCHER":
+                payment_methods.append(["4", "🎁 Ambil sebagai bonus (jika tersedia)"])
+
+            render_table("METODE PEMBAYARAN", payment_methods,
+                         headers=None, aligns=["center", "left"], style="blue", static=True, console=frame)
 
         # Input user
         choice = input("Pilih metode pembayaran: ").strip()
-        token_confirmation = package["token_confirmation"]
-        ts_to_sign = package["timestamp"]
         item_name = f"{variant_name} {option_name}".strip()
 
         try:
+            if choice in ("1", "2", "3") or (choice == "4" and payment_for == "REDEEM_VOUCHER"):
+                package = ensure_payment_token(api_key, tokens, package_option_code, package)
+                token_confirmation, ts_to_sign = package["token_confirmation"], package["timestamp"]
+
             if choice == "1":
-                purchase_package(api_key, tokens, package_option_code)
+                purchase_package(api_key, tokens, package_option_code, package_data=package)
                 console.print("Silahkan cek hasil pembelian di aplikasi MyXL.",
                               style="bold green")
                 pause()
@@ -162,7 +203,8 @@ def show_package_details(api_key, tokens, package_option_code, is_enterprise=Fal
                     family_name=family_name,
                     is_enterprise=is_enterprise,
                     variant_name=variant_name,
-                    option_name=option_name
+                    option_name=option_name,
+                    option_code=package_option_code
                 )
                 if success:
                     console.print("Paket berhasil ditambahkan ke bookmark.",
@@ -173,6 +215,10 @@ def show_package_details(api_key, tokens, package_option_code, is_enterprise=Fal
                 pause()
                 continue
 
+            elif choice.upper() == "R":
+                package, addons = fetch_package_screen(api_key, tokens, package_option_code, refresh=True)
+                continue
+
             elif choice == "00":
                 return None
 
@@ -1,14 +1,17 @@
 import json
 import shutil
 from api_request import send_api_request, get_family
+from cache import family_cache
 from auth_helper import AuthInstance
 from ui import show_package_details
+from table import render_table
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.align import Align
-from util import clear_screen, pause
+from util import pause
+from screen import ScreenInstance
+from profiling import profiled
 
 
 console = Console()
@@ -39,26 +42,45 @@ def add_family_code_auto(family_name: str, code: str, type_: str = "normal"):
 
 
 # ======================
-# Rich Table Renderer
+# Index Family
 # ======================
-def render_rich_table(title, rows, headers=None, col_aligns=None,show_header=None):
-    table = Table(title=title, show_lines=True, expand=True, show_header=False)
-    n_cols = len(headers) if headers else (len(rows[0]) if rows else 1)
-
-    for i in range(n_cols):
-        justify = col_aligns[i] if col_aligns and i < len(col_aligns) else "left"
-        col_title = headers[i] if headers and i < len(headers) else f"Col{i+1}"
-        table.add_column(col_title, justify=justify)
-
-    for row in rows:
-        table.add_row(*[str(cell) for cell in row])
-
-    console.print(table)
+def index_family_options(data: dict) -> dict:
+    """
+    Parse data get_family sekali jadi baris tabel per variant
+    dan index opsi paket per nomor & per package_option_code.
+    """
+    variants = []
+    by_number = {}
+    by_code = {}
+    option_number = 1
+
+    for variant in data["package_variants"]:
+        variant_table_rows = []
+        for option in variant["package_options"]:
+            package = {
+                "number": option_number,
+                "name": option["name"],
+                "price": option["price"],
+                "code": option["package_option_code"]
+            }
+            by_number[option_number] = package
+            by_code[package["code"]] = package
+            variant_table_rows.append([option_number, package["name"], f"Rp {package['price']:,}"])
+            option_number += 1
+        variants.append((variant["name"], variant_table_rows))
+
+    return {
+        "family_name": data["package_family"]["name"],
+        "variants": variants,
+        "by_number": by_number,
+        "by_code": by_code,
+    }
 
 
 # ======================
 # Menu Family Package
 # ======================
+@profiled("family_view")
 def get_packages_by_family(family_code: str, is_enterprise: bool = False):
     api_key = AuthInstance.api_key
     tokens = AuthInstance.get_active_tokens()
@@ -68,54 +90,40 @@ def get_packages_by_family(family_code: str, is_enterprise: bool = False):
         return None
 
     type_ = "enterprise" if is_enterprise else "normal"
-    packages = []
 
     data = get_family(api_key, tokens, family_code, is_enterprise)
     if not data:
         console.print(Panel("Failed to load family data.", title="ERROR", style="red"))
         pause()
         return None
+    index = index_family_options(data)
 
     in_package_menu = True
     while in_package_menu:
-        clear_screen()
-        family_name = data['package_family']["name"]
-        console.print(Panel(Align.center(f"📁 Family Name [bold]{family_name}[/bold]"), style="cyan"))
-
-
-        package_variants = data["package_variants"]
-        option_number = 1
-
-        for variant_number, variant in enumerate(package_variants, start=1):
-            variant_name = variant["name"]
-            console.print(Panel(Align.center(f"Variant [bold]{variant_number}: {variant_name}[/bold]"), style="magenta"))
-
-            variant_table_rows = []
-            for option in variant["package_options"]:
-                option_name = option["name"]
-                price = option["price"]
-                code = option["package_option_code"]
-
-                variant_table_rows.append([option_number, option_name, f"Rp {price:,}"])
-                packages.append({
-                    "number": option_number,
-                    "name": option_name,
-                    "price": price,
-                    "code": code
-                })
-                option_number += 1
-
-            if variant_table_rows:
-                render_rich_table("PAKET", variant_table_rows, headers=["No", "Nama Paket", "Harga"], col_aligns=["center", "left", "right"])
-
-        # Commands menu
-        commands = [
-        ["A", "💾 Simpan Family Code"],
-        ["00", "🔙 Kembali ke menu sebelumnya"]
-        ]
-        render_rich_table("COMMANDS", commands, headers=["Input", "Deskripsi"], col_aligns=["center", "left"], show_header=False)
-
-        pkg_choice = Prompt.ask("[cyan]Pilihan[/cyan]").strip().upper()
+        # Data dari cache disk bisa diperbarui refresh di background, index ulang hanya kalau berubah
+        latest = family_cache.get((family_code, is_enterprise))
+        if latest is not None and latest is not data:
+            data = latest
+            index = index_family_options(data)
+        family_name = index["family_name"]
+
+        with ScreenInstance.frame() as frame:
+            frame.print(Panel(Align.center(f"📁 Family Name [bold]{family_name}[/bold]"), style="cyan"))
+
+            for variant_number, (variant_name, variant_table_rows) in enumerate(index["variants"], start=1):
+                frame.print(Panel(Align.center(f"Variant [bold]{variant_number}: {variant_name}[/bold]"), style="magenta"))
+                if variant_table_rows:
+                    render_table("PAKET", variant_table_rows, headers=["No", "Nama Paket", "Harga"], aligns=["center", "left", "right"], show_header=False, show_lines=True, console=frame)
+
+            # Commands menu
+            commands = [
+            ["A", "💾 Simpan Family Code"],
+            ["00", "🔙 Kembali ke menu sebelumnya"]
+            ]
+            render_table("COMMANDS", commands, headers=["Input", "Deskripsi"], aligns=["center", "left"], show_header=False, show_lines=True, static=True, console=frame)
+
+        raw_choice = Prompt.ask("[cyan]Pilihan[/cyan]").strip()
+        pkg_choice = raw_choice.upper()
         if pkg_choice == "00":
             in_package_menu = False
             return None
@@ -123,8 +131,9 @@ def get_packages_by_family(family_code: str, is_enterprise: bool = False):
             confirm = Prompt.ask(f"Mau simpan Family Code ({family_name}) ? (y/n)").strip().lower()
             if confirm == "y":
                 add_family_code_auto(family_name, family_code, type_)
-        elif pkg_choice.isdigit():
-            selected_pkg = next((p for p in packages if p["number"] == int(pkg_choice)), None)
+        elif pkg_choice.isdigit() or raw_choice in index["by_code"]:
+            # Pilih lewat nomor opsi atau langsung package_option_code
+            selected_pkg = index["by_number"].get(int(pkg_choice)) if pkg_choice.isdigit() else index["by_code"][raw_choice]
             if not selected_pkg:
                 console.print(Panel("Paket tidak ditemukan. Silakan masukkan nomor yang benar.", style="red"))
                 pause()
@@ -137,4 +146,4 @@ def get_packages_by_family(family_code: str, is_enterprise: bool = False):
             console.print(Panel("Input tidak valid. Silakan masukkan nomor yang benar.", style="red"))
             pause()
 
-    return packages
+    return list(index["by_number"].values())
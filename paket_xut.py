@@ -3,30 +3,16 @@ import shutil
 from api_request import get_family
 from auth_helper import AuthInstance
 from util import pause, clear_screen
+from table import render_table
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
+from profiling import profiled
 
 PACKAGE_FAMILY_CODE = "08a3b1e6-8e78-4e45-a540-b40f06871cfe"
 console = Console()
 
 
-def render_rich_table(title, rows, headers=None, col_aligns=None):
-    """Render table menggunakan Rich"""
-    table = Table(title=title, show_lines=True, expand=True)
-
-    n_cols = len(headers) if headers else (len(rows[0]) if rows else 1)
-    for i in range(n_cols):
-        justify = col_aligns[i] if col_aligns and i < len(col_aligns) else "left"
-        col_title = headers[i] if headers and i < len(headers) else f"Col{i+1}"
-        table.add_column(col_title, justify=justify)
-
-    for row in rows:
-        table.add_row(*[str(cell) for cell in row])
-
-    console.print(table)
-
-
+@profiled("xut_packages")
 def get_package_xut():
     api_key = AuthInstance.api_key
     tokens = AuthInstance.get_active_tokens()
@@ -72,11 +58,12 @@ def get_package_xut():
             start_number += 1
 
         if variant_table_rows:
-            render_rich_table(
+            render_table(
                 f"PAKET VARIANT {variant_number}",
                 variant_table_rows,
                 headers=["No", "Nama Paket", "Harga"],
-                col_aligns=["center", "left", "right"]
+                aligns=["center", "left", "right"],
+                show_lines=True
             )
 
     return packages
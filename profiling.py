@@ -0,0 +1,158 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class Profiler:
+    """
+    Mode --profile: tiap aksi menu dijalankan di bawah cProfile (waktu CPU thread utama)
+    dan tracemalloc. Stats per aksi ditulis ke profiles/<sesi>/, ringkasan top-N dicetak saat keluar.
+    Aksi bersarang (mis. detail paket dari menu family) diprofil terpisah:
+    profiler aksi luar di-pause selama aksi dalam berjalan.
+    """
+    _instance_ = None
+    _initialized_ = False
+
+    enabled = False
+    profile_dir = "profiles"
+    top_n = 15
+    # Jumlah frame traceback tracemalloc per alokasi
+    trace_frames = 1
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance_:
+            cls._instance_ = super().__new__(cls)
+        return cls._instance_
+
+    def __init__(self):
+        if not self._initialized_:
+            self._stack = []
+            # Format: [cProfile.Profile] aksi yang sedang berjalan, paling dalam di akhir
+            self.results = []
+            # Format: [{"name", "wall_ms", "cpu_ms", "alloc_kb", "file"}]
+            self._stats = None
+            self._session_dir = None
+            self._seq = 0
+
+            self._initialized_ = True
+
+    def enable(self):
+        self.enabled = True
+        self._session_dir = os.path.join(self.profile_dir, datetime.now().strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(self._session_dir, exist_ok=True)
+        tracemalloc.start(self.trace_frames)
+
+    @contextmanager
+    def action(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        # time.thread_time: waktu CPU thread ini saja, jadi menunggu input/jaringan tidak terhitung
+        profile = cProfile.Profile(time.thread_time)
+        if self._stack:
+            self._stack[-1].disable()
+        self._stack.append(profile)
+        snapshot_before = tracemalloc.take_snapshot()
+        wall_start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            self._stack.pop()
+            # Simpan dulu baru lanjutkan profiler luar, supaya biaya _save
+            # (dump_stats, pstats, snapshot) tidak terhitung ke aksi luar
+            self._save(name, profile, wall_ms, snapshot_before, tracemalloc.take_snapshot())
+            if self._stack:
+                self._stack[-1].enable()
+
+    def _save(self, name, profile, wall_ms, snapshot_before, snapshot_after):
+        self._seq += 1
+        base = os.path.join(self._session_dir, f"{self._seq:03d}_{name}")
+        profile.dump_stats(base + ".prof")
+
+        stats = pstats.Stats(profile)
+        cpu_ms = stats.total_tt * 1000
+        # Gabungan semua aksi untuk ringkasan top fungsi
+        if self._stats is None:
+            self._stats = stats
+        else:
+            self._stats.add(profile)
+
+        alloc_diff = snapshot_after.compare_to(snapshot_before, "lineno")
+        alloc_kb = sum(stat.size_diff for stat in alloc_diff) / 1024
+
+        out = io.StringIO()
+        out.write(f"{name}: wall {wall_ms:.1f} ms, cpu {cpu_ms:.1f} ms, alloc {alloc_kb:+.1f} KB\n\n")
+        pstats.Stats(profile, stream=out).sort_stats("tottime").print_stats(self.top_n)
+        out.write(f"\nTop {self.top_n} alokasi memori (tracemalloc):\n")
+        for stat in alloc_diff[:self.top_n]:
+            out.write(f"{stat}\n")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(out.getvalue())
+
+        self.results.append({
+            "name": name,
+            "wall_ms": wall_ms,
+            "cpu_ms": cpu_ms,
+            "alloc_kb": alloc_kb,
+            "file": base + ".prof",
+        })
+
+    def print_summary(self):
+        if not self.enabled or not self.results:
+            return
+        # Import di dalam: table (rich) tidak perlu ikut di-load kalau profiling tidak aktif
+        from table import render_table
+
+        per_action = {}
+        for result in self.results:
+            entry = per_action.setdefault(result["name"], {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "alloc_kb": 0.0})
+            entry["count"] += 1
+            entry["wall_ms"] += result["wall_ms"]
+            entry["cpu_ms"] += result["cpu_ms"]
+            entry["alloc_kb"] += result["alloc_kb"]
+        rows = [
+            [name, entry["count"], f"{entry['cpu_ms']:.1f}", f"{entry['wall_ms']:.1f}", f"{entry['alloc_kb']:+.1f}"]
+            for name, entry in sorted(per_action.items(), key=lambda item: item[1]["cpu_ms"], reverse=True)
+        ]
+        render_table("PROFIL PER AKSI", rows[:self.top_n],
+                     headers=["Aksi", "Jumlah", "CPU ms", "Wall ms", "Alokasi KB"],
+                     aligns=["left", "center", "right", "right", "right"], style="magenta")
+
+        func_rows = []
+        self._stats.sort_stats("tottime")
+        for func in self._stats.fcn_list[:self.top_n]:
+            _, ncalls, tottime, cumtime, _ = self._stats.stats[func]
+            filename, lineno, funcname = func
+            func_rows.append([f"{funcname} ({os.path.basename(filename)}:{lineno})", ncalls,
+                              f"{tottime * 1000:.1f}", f"{cumtime * 1000:.1f}"])
+        render_table(f"TOP {self.top_n} FUNGSI (CPU)", func_rows,
+                     headers=["Fungsi", "Panggilan", "Self ms", "Kumulatif ms"],
+                     aligns=["left", "right", "right", "right"], style="magenta")
+        print(f"Stats per aksi: {self._session_dir}")
+
+
+# Singleton instance
+ProfilerInstance = Profiler()
+
+
+def profiled(name: str):
+    """Decorator: jalankan fungsi sebagai satu aksi profil (tanpa efek kalau --profile tidak aktif)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ProfilerInstance.enabled:
+                return fn(*args, **kwargs)
+            with ProfilerInstance.action(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
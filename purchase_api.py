@@ -1,32 +1,20 @@
 from datetime import datetime, timezone
 import uuid, json, time, base64
-import requests
-import qrcode
 import shutil
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
 
 from crypto_helper import API_KEY, encryptsign_xdata, decrypt_xdata, get_x_signature_payment, get_x_signature_bounty, java_like_timestamp
-from api_request import send_api_request
+from api_request import send_api_request, API_CALL_DEADLINE
+from transport import TransportInstance, deadline
+from tracing import TracerInstance
+from table import render_table
 
 BASE_API_URL = "https://api.myxl.xlaxiata.co.id"
 UA = "myXL / 8.6.0(1179); com.android.vending; (oppo; CPH1937; SDK 30; Android 11"
 
 console = Console()
 
-# ===========================
-# Render Table dengan Rich
-# ===========================
-def render_table(title, data, headers=None):
-    table = Table(title=title, show_header=bool(headers), header_style="bold magenta")
-    if headers:
-        for h in headers:
-            table.add_column(str(h))
-    for row in data:
-        table.add_row(*[str(c) for c in row])
-    console.print(table)
-
 # ===========================
 # Payment Methods
 # ===========================
@@ -79,34 +67,41 @@ def settlement_multipayment(api_key: str, tokens: dict, token_payment: str, ts_t
         "timestamp": int(time.time())
     }
 
-    encrypted_payload = encryptsign_xdata(api_key, "POST", path, tokens["id_token"], payload)
-    body = encrypted_payload["encrypted_body"]
-    xtime = int(body["xtime"])
-    sig_time_sec = xtime // 1000
-    x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
-    payload["timestamp"] = ts_to_sign
-
-    x_sig = get_x_signature_payment(api_key, tokens["access_token"], ts_to_sign, payment_target, token_payment, payment_method)
-    headers = {
-        "host": BASE_API_URL.replace("https://", ""),
-        "content-type": "application/json; charset=utf-8",
-        "user-agent": UA,
-        "x-api-key": API_KEY,
-        "authorization": f"Bearer {tokens['id_token']}",
-        "x-hv": "v3",
-        "x-signature-time": str(sig_time_sec),
-        "x-signature": x_sig,
-        "x-request-id": str(uuid.uuid4()),
-        "x-request-at": java_like_timestamp(x_requested_at),
-        "x-version-app": "8.6.0",
-    }
-
-    resp = requests.post(f"{BASE_API_URL}/{path}", headers=headers, data=json.dumps(body), timeout=30)
-    try:
-        return decrypt_xdata(api_key, resp.json())
-    except Exception as e:
-        console.print(f"[red][decrypt err][/red] {e}")
-        return resp.text
+    with TracerInstance.call(path) as call, deadline(API_CALL_DEADLINE):
+        with call.hop("encryptsign"):
+            encrypted_payload = encryptsign_xdata(api_key, "POST", path, tokens["id_token"], payload)
+        body = encrypted_payload["encrypted_body"]
+        xtime = int(body["xtime"])
+        sig_time_sec = xtime // 1000
+        x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
+        payload["timestamp"] = ts_to_sign
+
+        with call.hop("sign"):
+            x_sig = get_x_signature_payment(api_key, tokens["access_token"], ts_to_sign, payment_target, token_payment, payment_method)
+        headers = {
+            "host": BASE_API_URL.replace("https://", ""),
+            "content-type": "application/json; charset=utf-8",
+            "user-agent": UA,
+            "x-api-key": API_KEY,
+            "authorization": f"Bearer {tokens['id_token']}",
+            "x-hv": "v3",
+            "x-signature-time": str(sig_time_sec),
+            "x-signature": x_sig,
+            "x-request-id": str(uuid.uuid4()),
+            "x-request-at": java_like_timestamp(x_requested_at),
+            "x-version-app": "8.6.0",
+        }
+
+        call.set_request_id(headers["x-request-id"])
+        with call.hop("api"):
+            resp = TransportInstance.post(f"{BASE_API_URL}/{path}", headers=headers, data=json.dumps(body), timeout=30)
+        try:
+            with call.hop("decrypt"):
+                return decrypt_xdata(api_key, resp.json())
+        except Exception as e:
+            console.print(f"[red][decrypt err][/red] {e}")
+            call.fail(e)
+            return resp.text
 
 # ===========================
 # QRIS Settlement
@@ -123,36 +118,43 @@ def settlement_qris(api_key, tokens, token_payment, ts_to_sign, payment_target,
         "timestamp": int(time.time())
     }
 
-    encrypted_payload = encryptsign_xdata(api_key, "POST", path, tokens["id_token"], payload)
-    body = encrypted_payload["encrypted_body"]
-    xtime = int(body["xtime"])
-    sig_time_sec = xtime // 1000
-    x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
-    x_sig = get_x_signature_payment(api_key, tokens["access_token"], ts_to_sign, payment_target, token_payment, "QRIS")
-    headers = {
-        "host": BASE_API_URL.replace("https://", ""),
-        "content-type": "application/json; charset=utf-8",
-        "user-agent": UA,
-        "x-api-key": API_KEY,
-        "authorization": f"Bearer {tokens['id_token']}",
-        "x-hv": "v3",
-        "x-signature-time": str(sig_time_sec),
-        "x-signature": x_sig,
-        "x-request-id": str(uuid.uuid4()),
-        "x-request-at": java_like_timestamp(x_requested_at),
-        "x-version-app": "8.6.0",
-    }
-
-    resp = requests.post(f"{BASE_API_URL}/{path}", headers=headers, data=json.dumps(body), timeout=30)
-    try:
-        decrypted = decrypt_xdata(api_key, resp.json())
-        if decrypted["status"] != "SUCCESS":
-            console.print(f"[red]Failed to initiate settlement.[/red] Error: {decrypted}")
-            return None
-        return decrypted["data"]["transaction_code"]
-    except Exception as e:
-        console.print(f"[red][decrypt err][/red] {e}")
-        return resp.text
+    with TracerInstance.call(path) as call, deadline(API_CALL_DEADLINE):
+        with call.hop("encryptsign"):
+            encrypted_payload = encryptsign_xdata(api_key, "POST", path, tokens["id_token"], payload)
+        body = encrypted_payload["encrypted_body"]
+        xtime = int(body["xtime"])
+        sig_time_sec = xtime // 1000
+        x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
+        with call.hop("sign"):
+            x_sig = get_x_signature_payment(api_key, tokens["access_token"], ts_to_sign, payment_target, token_payment, "QRIS")
+        headers = {
+            "host": BASE_API_URL.replace("https://", ""),
+            "content-type": "application/json; charset=utf-8",
+            "user-agent": UA,
+            "x-api-key": API_KEY,
+            "authorization": f"Bearer {tokens['id_token']}",
+            "x-hv": "v3",
+            "x-signature-time": str(sig_time_sec),
+            "x-signature": x_sig,
+            "x-request-id": str(uuid.uuid4()),
+            "x-request-at": java_like_timestamp(x_requested_at),
+            "x-version-app": "8.6.0",
+        }
+
+        call.set_request_id(headers["x-request-id"])
+        with call.hop("api"):
+            resp = TransportInstance.post(f"{BASE_API_URL}/{path}", headers=headers, data=json.dumps(body), timeout=30)
+        try:
+            with call.hop("decrypt"):
+                decrypted = decrypt_xdata(api_key, resp.json())
+            if decrypted["status"] != "SUCCESS":
+                console.print(f"[red]Failed to initiate settlement.[/red] Error: {decrypted}")
+                return None
+            return decrypted["data"]["transaction_code"]
+        except Exception as e:
+            console.print(f"[red][decrypt err][/red] {e}")
+            call.fail(e)
+            return resp.text
 
 # ===========================
 # Show QRIS Payment
@@ -192,9 +194,10 @@ def show_qris_payment(api_key, tokens, package_option_code, token_confirmation,
         ["Transaction ID", transaction_id],
         ["QRIS Link", qris_url]
     ]
-    render_table("QRIS PAYMENT DETAILS", table_data, headers=["Field", "Value"])
+    render_table("QRIS PAYMENT DETAILS", table_data, headers=["Field", "Value"], style="magenta")
 
-    # QR Code
+    # QR Code (qrcode baru di-import saat dibutuhkan)
+    import qrcode
     qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=1, border=1)
     qr.add_data(qris_code)
     qr.make(fit=True)
@@ -220,37 +223,44 @@ def settlement_bounty(api_key, tokens, token_confirmation, ts_to_sign, payment_t
         "payment_method": "BALANCE"
     }
 
-    encrypted_payload = encryptsign_xdata(api_key, "POST", path, tokens["id_token"], payload)
-    body = encrypted_payload["encrypted_body"]
-    xtime = int(body["xtime"])
-    sig_time_sec = xtime // 1000
-    x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
-    x_sig = get_x_signature_bounty(api_key, tokens["access_token"], ts_to_sign, payment_target, token_confirmation)
-    headers = {
-        "host": BASE_API_URL.replace("https://", ""),
-        "content-type": "application/json; charset=utf-8",
-        "user-agent": UA,
-        "x-api-key": API_KEY,
-        "authorization": f"Bearer {tokens['id_token']}",
-        "x-hv": "v3",
-        "x-signature-time": str(sig_time_sec),
-        "x-signature": x_sig,
-        "x-request-id": str(uuid.uuid4()),
-        "x-request-at": java_like_timestamp(x_requested_at),
-        "x-version-app": "8.6.0",
-    }
-
-    resp = requests.post(f"{BASE_API_URL}/{path}", headers=headers, data=json.dumps(body), timeout=30)
-    try:
-        decrypted = decrypt_xdata(api_key, resp.json())
-        if decrypted["status"] != "SUCCESS":
-            console.print(f"[red]Failed to claim bounty.[/red] Error: {decrypted}")
-            return None
-        console.print(decrypted)
-        return decrypted
-    except Exception as e:
-        console.print(f"[red][decrypt err][/red] {e}")
-        return resp.text
+    with TracerInstance.call(path) as call, deadline(API_CALL_DEADLINE):
+        with call.hop("encryptsign"):
+            encrypted_payload = encryptsign_xdata(api_key, "POST", path, tokens["id_token"], payload)
+        body = encrypted_payload["encrypted_body"]
+        xtime = int(body["xtime"])
+        sig_time_sec = xtime // 1000
+        x_requested_at = datetime.fromtimestamp(sig_time_sec, tz=timezone.utc).astimezone()
+        with call.hop("sign"):
+            x_sig = get_x_signature_bounty(api_key, tokens["access_token"], ts_to_sign, payment_target, token_confirmation)
+        headers = {
+            "host": BASE_API_URL.replace("https://", ""),
+            "content-type": "application/json; charset=utf-8",
+            "user-agent": UA,
+            "x-api-key": API_KEY,
+            "authorization": f"Bearer {tokens['id_token']}",
+            "x-hv": "v3",
+            "x-signature-time": str(sig_time_sec),
+            "x-signature": x_sig,
+            "x-request-id": str(uuid.uuid4()),
+            "x-request-at": java_like_timestamp(x_requested_at),
+            "x-version-app": "8.6.0",
+        }
+
+        call.set_request_id(headers["x-request-id"])
+        with call.hop("api"):
+            resp = TransportInstance.post(f"{BASE_API_URL}/{path}", headers=headers, data=json.dumps(body), timeout=30)
+        try:
+            with call.hop("decrypt"):
+                decrypted = decrypt_xdata(api_key, resp.json())
+            if decrypted["status"] != "SUCCESS":
+                console.print(f"[red]Failed to claim bounty.[/red] Error: {decrypted}")
+                return None
+            console.print(decrypted)
+            return decrypted
+        except Exception as e:
+            console.print(f"[red][decrypt err][/red] {e}")
+            call.fail(e)
+            return resp.text
 
 def show_multipayment(api_key: str, tokens: dict, package_option_code: str, token_confirmation: str, price: int, item_name: str = ""):
     console.print("[bold cyan]Fetching available payment methods...[/bold cyan]")
@@ -281,12 +291,8 @@ def show_multipayment(api_key: str, tokens: dict, package_option_code: str, toke
 
     choosing = True
     while choosing:
-        table = Table(title="METODE PEMBAYARAN", show_header=True, header_style="bold magenta")
-        table.add_column("No", style="cyan", justify="center")
-        table.add_column("Metode", style="green")
-        for row in payment_options:
-            table.add_row(*row)
-        console.print(table)
+        render_table("METODE PEMBAYARAN", payment_options, headers=["No", "Metode"],
+                     aligns=["center", "left"], style="magenta", static=True)
 
         choice = console.input("Pilih metode pembayaran: ").strip()
         wallet_number = ""
@@ -0,0 +1,108 @@
+import io
+import os
+import shutil
+import sys
+import threading
+from contextlib import contextmanager
+
+from rich.console import Console
+
+# Cursor ke kiri atas, hapus layar & scrollback
+CLEAR = "\x1b[H\x1b[2J\x1b[3J"
+CLEAR_BELOW = "\x1b[J"
+CLEAR_LINE = "\x1b[K"
+
+
+class Screen:
+    """
+    Render satu layar penuh ke buffer lalu tulis ke terminal sekali,
+    menggantikan clear_screen() (subprocess `clear`) + banyak print terpisah.
+    """
+    _instance_ = None
+    _initialized_ = False
+
+    # Redraw hanya baris yang berubah. Hanya aman kalau tidak ada output lain
+    # yang membuat layar scroll di antara dua frame, jadi default-nya mati.
+    diff = False
+    # Sisa baris untuk prompt & pesan di bawah frame (mode diff)
+    prompt_margin = 5
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance_:
+            cls._instance_ = super().__new__(cls)
+        return cls._instance_
+
+    def __init__(self):
+        if not self._initialized_:
+            self._last_lines = None
+            self._last_size = None
+            # Console ke terminal asli, acuan warna & lebar untuk console frame
+            self._terminal = Console()
+            # Satu frame ditulis utuh sebelum frame lain (thread lain) mulai
+            self._lock = threading.Lock()
+
+            self._initialized_ = True
+
+    @contextmanager
+    def frame(self):
+        """
+        Yield Console dengan buffer privat; semua yang di-print ke console itu
+        ditulis ke terminal sebagai satu frame saat blok selesai.
+        sys.stdout tidak disentuh, jadi aman dipakai dari lebih dari satu thread.
+        """
+        buffer = io.StringIO()
+        console = Console(
+            file=buffer,
+            force_terminal=self._terminal.is_terminal,
+            color_system=self._terminal.color_system,
+            width=self._terminal.width,
+        )
+        try:
+            yield console
+        finally:
+            self.write(buffer.getvalue())
+
+    def write(self, content: str):
+        lines = content.splitlines()
+        size = shutil.get_terminal_size()
+        with self._lock:
+            if self.diff and self._can_diff(lines, size):
+                out = self._diff(lines)
+            else:
+                out = self._clear_sequence() + content
+            self._last_lines = lines
+            self._last_size = size
+            sys.stdout.write(out)
+            sys.stdout.flush()
+
+    def clear(self):
+        with self._lock:
+            self._last_lines = None
+            sys.stdout.write(self._clear_sequence())
+            sys.stdout.flush()
+
+    def _clear_sequence(self) -> str:
+        if os.name == "nt":
+            # Console Windows lama tidak kenal ANSI
+            os.system("cls")
+            return ""
+        return CLEAR
+
+    def _can_diff(self, lines, size) -> bool:
+        if self._last_lines is None or size != self._last_size or os.name == "nt":
+            return False
+        max_rows = size.lines - self.prompt_margin
+        return len(lines) <= max_rows and len(self._last_lines) <= max_rows
+
+    def _diff(self, lines) -> str:
+        out = []
+        for row, line in enumerate(lines, start=1):
+            if row > len(self._last_lines) or self._last_lines[row - 1] != line:
+                out.append(f"\x1b[{row};1H{line}{CLEAR_LINE}")
+        # Hapus sisa frame lama, prompt & input sebelumnya
+        out.append(f"\x1b[{len(lines) + 1};1H{CLEAR_BELOW}")
+        return "".join(out)
+
+
+# Singleton instance
+ScreenInstance = Screen()
@@ -1,9 +1,12 @@
 # table.py
+from functools import lru_cache
+
+from rich import box as rich_box
 from rich.console import Console
 from rich.table import Table
 import shutil
 
-console = Console()
+default_console = Console()
 
 def get_terminal_width(default=80):
     """Dapatkan lebar terminal"""
@@ -12,23 +15,15 @@ def get_terminal_width(default=80):
     except Exception:
         return default
 
-def render_table(title, data, headers=None, show_headers=True, aligns=None, style="cyan"):
-    """
-    Render tabel menggunakan Rich
-    - title: judul tabel
-    - data: list of list (rows)
-    - headers: list kolom atau None
-    - show_headers: tampilkan header atau tidak
-    - aligns: list alignment per kolom
-    - style: warna judul tabel
-    """
-
-    # Buat tabel
+def _build_table(title, rows, headers, aligns, style, show_header, show_lines, box, text_style):
     table = Table(
         title=f"[bold {style}]{title}[/bold {style}]" if title else None,
         title_justify="center",
-        show_header=False if headers is None else show_headers,
+        show_header=False if headers is None else show_header,
         header_style="bold",
+        show_lines=show_lines,
+        box=box,
+        border_style=style,
         expand=True  # 🔥 Biar full ke layar
     )
 
@@ -36,16 +31,58 @@ def render_table(title, data, headers=None, show_headers=True, aligns=None, styl
     if headers:
         for i, header in enumerate(headers):
             justify = aligns[i] if aligns and i < len(aligns) else "left"
-            table.add_column(header, justify=justify)
+            table.add_column(header, justify=justify, style=text_style)
     else:
-        col_count = max(len(row) for row in data) if data else 0
+        col_count = max(len(row) for row in rows) if rows else 0
         for i in range(col_count):
             justify = aligns[i] if aligns and i < len(aligns) else "left"
-            table.add_column("", justify=justify)  # 🔥 header kosong
+            table.add_column("", justify=justify, style=text_style)  # 🔥 header kosong
 
     # Isi baris
-    for row in data:
-        row_str = [str(c) if c is not None else "" for c in row]
-        table.add_row(*row_str)
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+@lru_cache(maxsize=64)
+def _render_static(width, color_system, args):
+    # width & color_system ikut jadi key: output ANSI beda per lebar/jenis terminal
+    capture_console = Console(width=width, color_system=color_system, force_terminal=color_system is not None)
+    with capture_console.capture() as capture:
+        capture_console.print(_build_table(*args))
+    return capture.get()
 
-    console.print(table)
+def render_table(title, data, headers=None, aligns=None, style="cyan", show_header=True,
+                 show_lines=False, box=rich_box.HEAVY_HEAD, text_style=None, static=False,
+                 console=None):
+    """
+    Render tabel menggunakan Rich
+    - title: judul tabel
+    - data: list of list (rows)
+    - headers: list kolom atau None
+    - show_header: tampilkan header atau tidak
+    - aligns: list alignment per kolom
+    - style: warna judul & border tabel
+    - show_lines / box / text_style: tampilan garis, border & warna isi
+    - static: isi tabel tidak pernah berubah (menu, command), hasil render di-cache
+      per isi & lebar terminal
+    - console: console tujuan (mis. console frame dari ScreenInstance.frame()),
+      default ke stdout
+    """
+    console = console or default_console
+    rows = tuple(tuple(str(c) if c is not None else "" for c in row) for row in data)
+    args = (
+        title,
+        rows,
+        tuple(headers) if headers else None,
+        tuple(aligns) if aligns else None,
+        style,
+        show_header,
+        show_lines,
+        box,
+        text_style,
+    )
+    if static:
+        console.file.write(_render_static(console.width, console.color_system, args))
+        console.file.flush()
+    else:
+        console.print(_build_table(*args))
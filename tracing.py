@@ -0,0 +1,189 @@
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Hop yang sedang berjalan; ikut ter-copy ke worker thread asyncio.to_thread
+_current_hop = contextvars.ContextVar("current_hop", default=None)
+# Panggilan API yang sedang berjalan (untuk record_failure dari helper yang tidak pegang ApiCall)
+_current_call = contextvars.ContextVar("current_call", default=None)
+
+PERCENTILES = (50, 95, 99)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def record_network(status: int, **timings):
+    """Dipanggil Transport tiap request selesai: tambahkan waktu jaringan ke hop yang sedang berjalan."""
+    hop = _current_hop.get()
+    if hop is None:
+        return
+    for key, value in timings.items():
+        hop[key] = round(hop.get(key, 0) + value, 2)
+    hop["status"] = status
+
+
+def record_failure(error: BaseException):
+    """Tandai panggilan API yang sedang berjalan gagal walau tidak ada exception yang keluar."""
+    call = _current_call.get()
+    if call is not None:
+        call.fail(error)
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile dari list yang sudah urut."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class ApiCall:
+    """Satu panggilan API (encryptsign -> API -> decrypt) beserta waktu tiap hop."""
+
+    def __init__(self, path: str):
+        self.record = {
+            "ts": time.time(),
+            "path": path,
+            "request_id": None,
+            "ok": True,
+            "total_ms": None,
+            "hops": {},
+            # Format: {"encryptsign": {"ms", "queue_ms", "connect_ms", "request_ms", "response_ms", "status"}, ...}
+        }
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def hop(self, name: str):
+        hop = {"ms": 0.0}
+        self.record["hops"][name] = hop
+        token = _current_hop.set(hop)
+        start = time.perf_counter()
+        try:
+            yield hop
+        finally:
+            hop["ms"] = _ms(time.perf_counter() - start)
+            _current_hop.reset(token)
+
+    def set_request_id(self, request_id: str):
+        self.record["request_id"] = request_id
+
+    def fail(self, error: BaseException):
+        """Error yang ditangani (mis. decrypt gagal lalu return teks mentah) tetap dihitung gagal."""
+        self.record["ok"] = False
+        self.record["error"] = type(error).__name__
+        hop = _current_hop.get()
+        if hop is not None:
+            hop["error"] = type(error).__name__
+
+
+class Tracer:
+    """
+    Trace latensi per hop untuk setiap panggilan API, ditulis ke file JSONL
+    (satu baris per panggilan) dan diringkas jadi p50/p95/p99 per endpoint.
+    """
+    _instance_ = None
+    _initialized_ = False
+
+    enabled = True
+    trace_file = "api_trace.jsonl"
+    # File trace dirotasi ke .1 kalau lebih besar dari ini
+    max_bytes = 2_000_000
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance_:
+            cls._instance_ = super().__new__(cls)
+        return cls._instance_
+
+    def __init__(self):
+        if not self._initialized_:
+            self._lock = threading.Lock()
+
+            self._initialized_ = True
+
+    @contextmanager
+    def call(self, path: str):
+        call = ApiCall(path)
+        token = _current_call.set(call)
+        try:
+            yield call
+        except BaseException as e:
+            call.record["ok"] = False
+            call.record["error"] = type(e).__name__
+            raise
+        finally:
+            _current_call.reset(token)
+            call.record["total_ms"] = _ms(time.perf_counter() - call._start)
+            self.write(call.record)
+
+    def write(self, record: dict):
+        if not self.enabled:
+            return
+        line = json.dumps(record) + "\n"
+        try:
+            with self._lock:
+                if os.path.exists(self.trace_file) and os.path.getsize(self.trace_file) > self.max_bytes:
+                    os.replace(self.trace_file, self.trace_file + ".1")
+                with open(self.trace_file, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError:
+            pass
+
+    def load(self) -> list:
+        """Semua record trace (file rotasi lama dulu)."""
+        records = []
+        for path in (self.trace_file + ".1", self.trace_file):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+        return records
+
+    def summary(self) -> dict:
+        """
+        Ringkasan per endpoint.
+        Format: {path: {"count": int, "errors": int, "total": {50: ms, 95: ms, 99: ms},
+                        "hops": {hop: {50: ms, ...}, "api.connect": {...}}}}
+        """
+        samples = {}
+        for record in self.load():
+            path = record.get("path") or "?"
+            entry = samples.setdefault(path, {"count": 0, "errors": 0, "total": [], "hops": {}})
+            entry["count"] += 1
+            if not record.get("ok", True):
+                entry["errors"] += 1
+            if record.get("total_ms") is not None:
+                entry["total"].append(record["total_ms"])
+            for name, hop in record.get("hops", {}).items():
+                entry["hops"].setdefault(name, []).append(hop.get("ms", 0))
+                if "connect_ms" in hop:
+                    entry["hops"].setdefault(f"{name}.connect", []).append(hop["connect_ms"])
+
+        result = {}
+        for path, entry in samples.items():
+            result[path] = {
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "total": self._percentiles(entry["total"]),
+                "hops": {name: self._percentiles(values) for name, values in entry["hops"].items()},
+            }
+        return result
+
+    @staticmethod
+    def _percentiles(values: list) -> dict:
+        values = sorted(values)
+        return {p: percentile(values, p) for p in PERCENTILES}
+
+
+# Singleton instance
+TracerInstance = Tracer()
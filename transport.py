@@ -0,0 +1,373 @@
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from tracing import record_network
+
+DEFAULT_TIMEOUT = 30
+
+# Batas waktu (time.monotonic) untuk semua request di context ini; ikut ke worker asyncio.to_thread
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Budget waktu satu panggilan (semua hop) habis."""
+
+
+class RequestCancelled(requests.exceptions.RequestException):
+    """Request dibatalkan user dengan Ctrl+C."""
+
+
+class CircuitOpen(requests.exceptions.ConnectionError):
+    """Host sedang dianggap down oleh circuit breaker, request ditolak tanpa dikirim."""
+
+
+# Status yang layak di-retry (throttling / gateway bermasalah)
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+# Status yang dihitung sebagai host gagal oleh circuit breaker
+BREAKER_STATUS = frozenset({502, 503, 504})
+
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    Semua request di dalam blok ini berbagi satu budget waktu.
+    Tiap hop hanya dapat sisa budget; deadline bersarang ambil yang paling cepat habis.
+    """
+    target = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        target = min(target, outer)
+    token = _deadline.set(target)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget():
+    """Sisa budget (detik) deadline yang aktif, atau None kalau tidak ada deadline."""
+    target = _deadline.get()
+    if target is None:
+        return None
+    return target - time.monotonic()
+
+
+# Waktu DNS + TCP (+ TLS) koneksi baru di thread ini selama request berjalan
+_connect_time = threading.local()
+
+
+def _add_connect_time(seconds: float):
+    _connect_time.seconds = getattr(_connect_time, "seconds", 0.0) + seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _CircuitBreaker:
+    """
+    Circuit breaker satu host: setelah `threshold` kegagalan beruntun, request ke host itu
+    langsung ditolak selama `cooldown` detik. Setelah itu satu request percobaan
+    (half-open) boleh lewat; sukses menutup circuit, gagal membukanya lagi.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            # Percobaan half-open; cooldown dimulai ulang supaya hanya satu request yang lewat
+            # (dan circuit tidak macet kalau percobaan ini tidak pernah selesai)
+            self.opened_at = time.monotonic()
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                self._trial = False
+
+
+class _TokenBucket:
+    """
+    Rate limiter satu host: isi `rate` token per detik sampai maksimal `burst`,
+    tiap request ambil satu token. Token boleh minus (reservasi), jadi request
+    yang datang bersamaan dari banyak thread antre rapi tanpa polling.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Ambil satu token; return berapa detik harus menunggu sebelum request boleh dikirim."""
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self):
+        """Kembalikan token reservasi yang batal dipakai."""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def drain(self):
+        """Server membalas 429: buang sisa burst supaya request berikutnya ikut laju `rate`."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class Transport:
+    """
+    HTTP transport bersama untuk semua request keluar.
+    Satu requests.Session (connection pool + keep-alive) per host,
+    jadi encryptsign -> API -> decrypt tidak handshake TLS ulang tiap kali.
+    """
+    _instance_ = None
+    _initialized_ = False
+
+    pool_maxsize = 10
+    # Retry (hanya kalau caller minta retry=True, yaitu endpoint idempotent):
+    # exponential backoff dengan full jitter, dibatasi sisa deadline
+    retry_attempts = 3
+    retry_base_delay = 0.25
+    retry_max_delay = 2.0
+    # Circuit breaker per host
+    breaker_threshold = 5
+    breaker_cooldown = 15
+    # Rate limit per host (request/detik, burst) untuk semua request keluar
+    rate_limit = 5.0
+    rate_burst = 5
+    # Satu panggilan API = 2 request ke layanan crypto (encryptsign + decrypt)
+    host_rate_limits = {
+        "crypto.mashu.lol": (10.0, 10),
+    }
+    # Format: {"host": (rate, burst)}
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance_:
+            cls._instance_ = super().__new__(cls)
+        return cls._instance_
+
+    def __init__(self):
+        if not self._initialized_:
+            self.sessions = {}
+            # Format: {"host": requests.Session}
+            self.breakers = {}
+            # Format: {"host": _CircuitBreaker}
+            self.buckets = {}
+            # Format: {"host": _TokenBucket}
+            self._lock = threading.Lock()
+
+            self._initialized_ = True
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        # Pool dengan koneksi yang mencatat waktu connect untuk trace latensi
+        adapter.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        host = urlsplit(url).netloc
+        session = self.sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self.sessions.get(host)
+                if session is None:
+                    session = self._new_session()
+                    self.sessions[host] = session
+        return session
+
+    def get_breaker(self, url: str) -> _CircuitBreaker:
+        host = urlsplit(url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(host, _CircuitBreaker(self.breaker_threshold, self.breaker_cooldown))
+        return breaker
+
+    def get_bucket(self, url: str) -> _TokenBucket:
+        host = urlsplit(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            rate, burst = self.host_rate_limits.get(host, (self.rate_limit, self.rate_burst))
+            with self._lock:
+                bucket = self.buckets.setdefault(host, _TokenBucket(rate, burst))
+        return bucket
+
+    def request(self, method: str, url: str, retry: bool = False, **kwargs) -> requests.Response:
+        """
+        Kirim request lewat session host-nya.
+        retry=True hanya untuk endpoint idempotent: error koneksi/timeout dan status
+        RETRYABLE_STATUS dicoba ulang sampai retry_attempts kali.
+        """
+        breaker = self.get_breaker(url)
+        attempts = self.retry_attempts if retry else 1
+        try:
+            for attempt in range(1, attempts + 1):
+                if not breaker.allow():
+                    raise CircuitOpen(f"Circuit open for {urlsplit(url).netloc}, skipping {method} {url}")
+                last = attempt == attempts
+                try:
+                    resp = self._send(method, url, **kwargs)
+                except DeadlineExceeded:
+                    # Budget panggilan habis (termasuk timeout yang dipotong deadline):
+                    # bukan tanda host down, jadi tidak dihitung circuit breaker dan tidak di-retry
+                    raise
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    breaker.record_failure()
+                    if last or not self._backoff(attempt):
+                        raise
+                    continue
+
+                if resp.status_code == 429:
+                    self.get_bucket(url).drain()
+                if resp.status_code in BREAKER_STATUS:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if last or resp.status_code not in RETRYABLE_STATUS or not self._backoff(attempt):
+                    return resp
+        except KeyboardInterrupt:
+            # Ctrl+C saat menunggu jaringan: batalkan request ini saja, bukan keluar aplikasi
+            raise RequestCancelled(f"{method} {url} cancelled")
+
+    def _backoff(self, attempt: int) -> bool:
+        """Tidur sebelum retry berikutnya; False kalau sisa deadline tidak cukup untuk retry."""
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+        budget = remaining_budget()
+        if budget is not None and budget <= delay:
+            return False
+        time.sleep(delay)
+        return True
+
+    def _throttle(self, method: str, url: str) -> float:
+        """Tunggu giliran dari rate limiter host; return lama menunggu (detik)."""
+        bucket = self.get_bucket(url)
+        wait = bucket.reserve()
+        if wait <= 0:
+            return 0.0
+        budget = remaining_budget()
+        if budget is not None and wait >= budget:
+            bucket.refund()
+            raise DeadlineExceeded(f"Deadline exceeded waiting for rate limit before {method} {url}")
+        try:
+            time.sleep(wait)
+        except KeyboardInterrupt:
+            bucket.refund()
+            raise
+        return wait
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        queued = self._throttle(method, url)
+        timeout = kwargs.get("timeout") or DEFAULT_TIMEOUT
+        budget = remaining_budget()
+        # Timeout dipotong deadline: kalau habis, itu budget panggilan yang habis, bukan host lambat
+        capped_by_deadline = budget is not None and budget < timeout
+        if budget is not None and budget <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before {method} {url}")
+        if capped_by_deadline:
+            timeout = budget
+        kwargs["timeout"] = timeout
+
+        _connect_time.seconds = 0.0
+        start = time.perf_counter()
+        try:
+            resp = self.get_session(url).request(method, url, **kwargs)
+        except requests.exceptions.Timeout as e:
+            if capped_by_deadline:
+                raise DeadlineExceeded(f"Deadline exceeded during {method} {url}") from e
+            raise
+        total = time.perf_counter() - start
+
+        # elapsed = kirim request s/d header response diterima (termasuk connect),
+        # sisanya baca body
+        connect = _connect_time.seconds
+        elapsed = resp.elapsed.total_seconds()
+        record_network(
+            resp.status_code,
+            queue_ms=queued * 1000,
+            connect_ms=connect * 1000,
+            request_ms=max(elapsed - connect, 0) * 1000,
+            response_ms=max(total - elapsed, 0) * 1000,
+        )
+        return resp
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+
+
+# Singleton instance
+TransportInstance = Transport()
@@ -11,14 +11,17 @@ from api_request import get_otp, submit_otp, save_tokens, get_package, purchase_
 from purchase_api import show_multipayment, show_qris_payment, settlement_bounty
 from bookmark import show_bookmark_menu, BookmarkInstance
 from auth_helper import AuthInstance
-from util import display_html, clear_screen, pause, ascii_art, show_banner, save_banner_url
+from util import display_html, clear_screen, pause, show_banner, save_banner_url, DEFAULT_BANNER_URL
 from package import show_package_details
+from screen import ScreenInstance
+import table
 
 from rich.console import Console
 from rich.table import Table
 from rich.align import Align
 from rich import box
 from rich.text import Text
+from profiling import profiled
 
 console = Console()
 
@@ -35,103 +38,68 @@ def get_terminal_width(default=70):
         return default
 
 
-def show_banner():
-    term_width = shutil.get_terminal_size().columns
-    buffer = io.StringIO()
-    sys.stdout = buffer
-    ascii_art.to_terminal(columns=60)
-    sys.stdout = sys.__stdout__
-    banner_lines = [line.center(term_width) for line in buffer.getvalue().splitlines()]
-    console.print("\n".join(banner_lines), style="bold blue")
-
-
 # -----------------------------
 # Render table full-width dengan Rich
 # -----------------------------
-def render_table(title, rows, headers=None, aligns=None, style="white", show_header=True):
-    """Render table dengan Rich, full-width, border tebal, judul bold, kolom Value left-aligned"""
-    term_width = shutil.get_terminal_size().columns
-
-    table = Table(
-        show_lines=True,
-        show_header=show_header,
-        title=Text(title, style=f"bold {style}", justify="center"),
-        box=box.DOUBLE_EDGE,
-        width=term_width
-    )
-
+def render_table(title, rows, headers=None, aligns=None, style="white", show_header=True, static=False, console=None):
+    """Render table full-width, border double, garis per baris, isi berwarna sesuai style"""
     n_cols = len(headers) if headers else len(rows[0]) if rows else 1
-
-    # Default alignment
-    if aligns is None:
-        aligns = ["center"] * n_cols
-
-    # Pastikan kolom Value align left jika ada
-    if headers and "Value" in headers:
-        for i, h in enumerate(headers):
-            if h.lower() == "value":
-                aligns[i] = "left"
-
-    # Tambahkan kolom
-    if headers:
-        for i, h in enumerate(headers):
-            col_align = aligns[i] if i < len(aligns) else "left"
-            table.add_column(h, justify=col_align, style=style)
-    else:
-        for i in range(n_cols):
-            col_align = aligns[i] if i < len(aligns) else "left"
-            table.add_column("", justify=col_align, style=style)
-
-    # Tambahkan baris
-    for row in rows:
-        str_row = [str(cell) for cell in row]
-        table.add_row(*str_row)
-
-    # Center table
-    console.print(Align.center(table))
+    table.render_table(
+        title, rows, headers=headers,
+        aligns=aligns or ["center"] * n_cols,
+        style=style, show_header=show_header,
+        show_lines=True, box=box.DOUBLE_EDGE, text_style=style,
+        static=static, console=console,
+    )
 
 # -----------------------------
 # UI Functions
 # -----------------------------
-def show_main_menu(number, balance, balance_expired_at, display_quota=None):
-    clear_screen()
-    show_banner()
-    expired_at_dt = datetime.fromtimestamp(balance_expired_at).strftime("%Y-%m-%d %H:%M:%S")
-
-    account_info = [
-        ["📱 Nomor", number],
-        ["💰 Pulsa", f"Rp {balance}"],
-        ["⏳ Masa Aktif", expired_at_dt],
-    ]
-    if display_quota:
-        account_info.append(["📶 Kuota", display_quota])
-
-    menu_options = [
-        ["1", "☑️ Login/Ganti akun"],
-        ["2", "🔹 Lihat Paket Saya"],
-        ["3", "🛒 Beli Paket XUT"],
-        ["4", "💎 Beli Paket Berdasarkan Family Code"],
-        ["5", "💎 Beli Paket Berdasarkan Family Code (Enterprise)"],
-        ["6", "✨ List Family Code"],
-        ["7", "📔 Bookmarks Paket"],
-        ["8", "⚙️ Pengaturan"],
-        ["99", "❌ Tutup aplikasi"],
-    ]
-
-    render_table("INFORMASI AKUN", account_info, headers=["Keterangan", "Value"], aligns=["left", "left"], style="red",show_header=False)
-    render_table("MAIN MENU", menu_options, headers=["No", "Keterangan"], aligns=["center", "left"], style="blue",show_header=False)
+def show_main_menu(number, balance, balance_expired_at, display_quota=None, stale_since=None):
+    with ScreenInstance.frame() as frame:
+        show_banner(frame)
+        expired_at_dt = datetime.fromtimestamp(balance_expired_at).strftime("%Y-%m-%d %H:%M:%S")
+
+        account_info = [
+            ["📱 Nomor", number],
+            ["💰 Pulsa", f"Rp {balance}"],
+            ["⏳ Masa Aktif", expired_at_dt],
+        ]
+        if display_quota:
+            account_info.append(["📶 Kuota", display_quota])
+        if stale_since:
+            stale_dt = datetime.fromtimestamp(stale_since).strftime("%Y-%m-%d %H:%M:%S")
+            account_info.append(["🕒 Data", f"[yellow]Tersimpan {stale_dt}, sedang memperbarui...[/yellow]"])
+
+        menu_options = [
+            ["1", "☑️ Login/Ganti akun"],
+            ["2", "🔹 Lihat Paket Saya"],
+            ["3", "🛒 Beli Paket XUT"],
+            ["4", "💎 Beli Paket Berdasarkan Family Code"],
+            ["5", "💎 Beli Paket Berdasarkan Family Code (Enterprise)"],
+            ["6", "✨ List Family Code"],
+            ["7", "📔 Bookmarks Paket"],
+            ["8", "⚙️ Pengaturan"],
+            ["9", "📊 Ringkasan Semua Akun"],
+            ["10", "⏱️ Statistik Latensi API"],
+            ["99", "❌ Tutup aplikasi"],
+        ]
+
+        render_table("INFORMASI AKUN", account_info, headers=["Keterangan", "Value"], aligns=["left", "left"], style="red",show_header=False, console=frame)
+        render_table("MAIN MENU", menu_options, headers=["No", "Keterangan"], aligns=["center", "left"], style="blue",show_header=False, static=True, console=frame)
 
+@profiled("account_menu")
 def show_account_menu():
     clear_screen()
     AuthInstance.load_tokens()
     users = AuthInstance.refresh_tokens
     active_user = AuthInstance.get_active_user()
+    # Siapkan token akun lain selagi user memilih
+    AuthInstance.warm_tokens_in_background()
 
     in_account_menu = True
     add_user = False
     while in_account_menu:
-        clear_screen()
-        show_banner()
         if active_user is None or add_user:
             number, refresh_token = login_prompt(AuthInstance.api_key)
             if not refresh_token:
@@ -145,24 +113,26 @@ def show_account_menu():
             active_user = AuthInstance.get_active_user()
             continue
 
-        if not users:
-            render_table("AKUN TERSIMPAN", [["-", "Tidak ada akun tersimpan"]],
-                         headers=["No", "Nomor HP"], aligns=["center", "left"], style="red")
-        else:
-            table_data = []
-            for idx, user in enumerate(users):
-                is_active = active_user and str(user["number"]) == str(active_user["number"])
-                marker = " (Aktif)" if is_active else ""
-                table_data.append([str(idx + 1), str(user["number"]) + marker])
-            render_table("AKUN TERSIMPAN", table_data,
-                         headers=["No", "Nomor HP"], aligns=["center", "left"], style="red")
-
-        commands = [
-            ["0", "➕ Tambah Akun"],
-            ["00", "↩️ Kembali ke menu utama"],
-            ["99", "❌ Hapus Akun aktif"],
-        ]
-        render_table("COMMANDS", commands, headers=["No", "Keterangan"], aligns=["center", "left"], style="blue")
+        with ScreenInstance.frame() as frame:
+            show_banner(frame)
+            if not users:
+                render_table("AKUN TERSIMPAN", [["-", "Tidak ada akun tersimpan"]],
+                             headers=["No", "Nomor HP"], aligns=["center", "left"], style="red", console=frame)
+            else:
+                table_data = []
+                for idx, user in enumerate(users):
+                    is_active = active_user and str(user["number"]) == str(active_user["number"])
+                    marker = " (Aktif)" if is_active else ""
+                    table_data.append([str(idx + 1), str(user["number"]) + marker])
+                render_table("AKUN TERSIMPAN", table_data,
+                             headers=["No", "Nomor HP"], aligns=["center", "left"], style="red", console=frame)
+
+            commands = [
+                ["0", "➕ Tambah Akun"],
+                ["00", "↩️ Kembali ke menu utama"],
+                ["99", "❌ Hapus Akun aktif"],
+            ]
+            render_table("COMMANDS", commands, headers=["No", "Keterangan"], aligns=["center", "left"], style="blue", static=True, console=frame)
 
         input_str = input("Pilihan: ")
         if input_str == "00":
@@ -194,9 +164,9 @@ def show_account_menu():
             pause()
 
 def login_prompt(api_key: str):
-    clear_screen()
-    show_banner()
-    render_table("LOGIN KE MYXL", [["-", ""]], style="blue")
+    with ScreenInstance.frame() as frame:
+        show_banner(frame)
+        render_table("LOGIN KE MYXL", [["-", ""]], style="blue", static=True, console=frame)
     phone_number = input("Masukan nomor XL Prabayar (Contoh 6281234567890): ")
 
     if not phone_number.startswith("628") or not (10 <= len(phone_number) <= 14):
@@ -222,6 +192,7 @@ def login_prompt(api_key: str):
         return phone_number, tokens["refresh_token"]
     except Exception:
         return None, None
+@profiled("package_menu")
 def show_package_menu(packages):
     api_key = AuthInstance.api_key
     tokens = AuthInstance.get_active_tokens()
@@ -231,32 +202,35 @@ def show_package_menu(packages):
         return None
 
     while True:
-        clear_screen()
-        show_banner()
-
-        # Data tabel: No, Nama Paket, Harga
-        table_data = [
-            [pkg["number"], f"📦 {pkg['name']}", f"Rp {pkg['price']}"]
-            for pkg in packages
-        ]
-
-        # Tabel paket tersedia
-        render_table(
-            "PAKET TERSEDIA",
-            table_data,
-            headers=["No", "Nama Paket", "Harga"],
-            aligns=["center", "left", "left"],
-            style="green"
-        )
-
-        # Tabel kembali
-        render_table(
-            "KEMBALI",
-            [["99 ↩️ Kembali ke menu utama"]],
-            headers=["Keterangan"],
-            aligns=["left"],
-            style="yellow"
-        )
+        with ScreenInstance.frame() as frame:
+            show_banner(frame)
+
+            # Data tabel: No, Nama Paket, Harga
+            table_data = [
+                [pkg["number"], f"📦 {pkg['name']}", f"Rp {pkg['price']}"]
+                for pkg in packages
+            ]
+
+            # Tabel paket tersedia
+            render_table(
+                "PAKET TERSEDIA",
+                table_data,
+                headers=["No", "Nama Paket", "Harga"],
+                aligns=["center", "left", "left"],
+                style="green",
+                console=frame
+            )
+
+            # Tabel kembali
+            render_table(
+                "KEMBALI",
+                [["99 ↩️ Kembali ke menu utama"]],
+                headers=["Keterangan"],
+                aligns=["left"],
+                style="yellow",
+                static=True,
+                console=frame
+            )
 
         pkg_choice = input("Pilih paket (nomor): ").strip()
         if pkg_choice == "99":
@@ -277,42 +251,45 @@ def show_package_menu(packages):
         if is_done:
             return None
 
+@profiled("settings")
 def show_settings_menu():
     """
     Menu Pengaturan: ganti banner, reset banner, dsb.
     """
-    global ascii_art  # ← harus di awal fungsi
     in_settings_menu = True
-    DEFAULT_BANNER_URL = "https://d17e22l2uh4h4n.cloudfront.net/corpweb/pub-xlaxiata/2019-03/xl-logo.png"
 
     while in_settings_menu:
-        clear_screen()
-        show_banner()
-
-        # Tabel opsi pengaturan
-        settings_options = [
-            ["1", "🖼 Ganti Banner"],
-            ["2", "⚡ Reset Banner ke Default"],
-        ]
-        render_table(
-            "⚙️ PENGATURAN",
-            settings_options,
-            headers=["No", "Pilihan"],
-            aligns=["center", "left"],
-            style="cyan"
-        )
-
-        # Tabel command
-        commands = [
-            ["00", "↩️ Kembali ke menu utama"],
-        ]
-        render_table(
-            "COMMANDS",
-            commands,
-            headers=["No", "Keterangan"],
-            aligns=["center", "left"],
-            style="yellow"
-        )
+        with ScreenInstance.frame() as frame:
+            show_banner(frame)
+
+            # Tabel opsi pengaturan
+            settings_options = [
+                ["1", "🖼 Ganti Banner"],
+                ["2", "⚡ Reset Banner ke Default"],
+            ]
+            render_table(
+                "⚙️ PENGATURAN",
+                settings_options,
+                headers=["No", "Pilihan"],
+                aligns=["center", "left"],
+                style="cyan",
+                static=True,
+                console=frame
+            )
+
+            # Tabel command
+            commands = [
+                ["00", "↩️ Kembali ke menu utama"],
+            ]
+            render_table(
+                "COMMANDS",
+                commands,
+                headers=["No", "Keterangan"],
+                aligns=["center", "left"],
+                style="yellow",
+                static=True,
+                console=frame
+            )
 
         choice = input("Pilih opsi pengaturan: ").strip()
 
@@ -327,7 +304,7 @@ def show_settings_menu():
                 pause()
                 continue
             try:
-                ascii_art = banner.load(new_url, globals())
+                banner.download(new_url)
                 save_banner_url(new_url)  # simpan ke config.json
                 console.print("Banner berhasil diganti dan disimpan!", style="bold green")
             except Exception as e:
@@ -337,7 +314,7 @@ def show_settings_menu():
 
         elif choice == "2":
             try:
-                ascii_art = banner.load(DEFAULT_BANNER_URL, globals())
+                banner.download(DEFAULT_BANNER_URL)
                 save_banner_url(DEFAULT_BANNER_URL)  # reset config.json
                 console.print("Banner berhasil di-reset ke default.", style="bold green")
             except Exception as e:
@@ -1,11 +1,14 @@
 import os, json
 import sys
-import re
-import textwrap
+import shutil
+import hashlib
 from html.parser import HTMLParser
 import banner
 
 import requests  # masih dipakai kalau ada request di api_request.py
+from rich.console import Console
+from screen import ScreenInstance
+from cache import html_text_cache
 
 from api_request import *
 from ui import *
@@ -13,32 +16,17 @@ from ui import *
 CONFIG_FILE = "config.json"
 DEFAULT_BANNER_URL = "https://d17e22l2uh4h4n.cloudfront.net/corpweb/pub-xlaxiata/2019-03/xl-logo.png"
 
-# ==========================
-# Load banner dari config
-# ==========================
-def load_banner():
-    url = DEFAULT_BANNER_URL
-    if os.path.exists(CONFIG_FILE):
-        try:
-            cfg = json.load(open(CONFIG_FILE, "r", encoding="utf-8"))
-            url = cfg.get("banner_url", DEFAULT_BANNER_URL)
-        except:
-            pass
-    return banner.load(url, globals())
-
-ascii_art = load_banner()
+banner_console = Console()
 
 # ==========================
 # Tampilkan banner
 # ==========================
-def show_banner():
+def show_banner(console=None):
+    # Baris ASCII dari cache lokal, tanpa download/konversi ulang tiap redraw
     term_width = shutil.get_terminal_size().columns
-    buffer = io.StringIO()
-    sys.stdout = buffer
-    ascii_art.to_terminal(columns=60)
-    sys.stdout = sys.__stdout__
-    banner_lines = [line.center(term_width) for line in buffer.getvalue().splitlines()]
-    console.print("\n".join(banner_lines), style="bold blue")
+    lines = banner.render_lines(term_width)
+    if lines:
+        (console or banner_console).print("\n".join(lines), style="bold blue")
 
 # ==========================
 # Simpan banner baru
@@ -49,7 +37,8 @@ def save_banner_url(url):
 
 
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Escape ANSI, tanpa spawn proses `clear`
+    ScreenInstance.clear()
 
 def pause():
     input("\nTekan Enter untuk lanjut...")
@@ -136,43 +125,94 @@ def ensure_api_key() -> str:
 
 
 class HTMLToText(HTMLParser):
+    """HTML -> teks ter-wrap dalam satu pass: kata langsung disusun per baris saat parsing."""
+
+    # Tag blok memisahkan kata; tag inline (<b>, <span>, ...) tidak
+    BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6"}
+
     def __init__(self, width=100):
         super().__init__()
         self.width = width
-        self.result = []
+        self.lines = []
+        self.words = []  # kata di baris yang sedang disusun
+        self.line_len = 0
         self.in_li = False
+        self.li_start = False
+        # Chunk berikutnya jadi kata baru (bukan disambung ke kata terakhir)
+        self.separated = True
+
+    def _break_line(self):
+        if self.words:
+            self.lines.append(" ".join(self.words))
+            self.words = []
+            self.line_len = 0
+        elif self.lines and self.lines[-1] != "":
+            # Maksimal satu baris kosong berturut-turut
+            self.lines.append("")
 
     def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCK_TAGS:
+            self.separated = True
         if tag == "li":
+            if self.words:
+                self._break_line()
             self.in_li = True
+            self.li_start = True
         elif tag == "br":
-            self.result.append("\n")
+            self._break_line()
 
     def handle_endtag(self, tag):
+        if tag in self.BLOCK_TAGS:
+            self.separated = True
         if tag == "li":
             self.in_li = False
-            self.result.append("\n")
+            self._break_line()
 
     def handle_data(self, data):
-        text = data.strip()
-        if text:
-            if self.in_li:
-                self.result.append(f"- {text}")
-            else:
-                self.result.append(text)
+        words = data.split()
+        if not words:
+            if data:
+                self.separated = True
+            return
+        if self.in_li and self.li_start:
+            words[0] = f"- {words[0]}"
+            self.li_start = False
+        if self.words and not self.separated and not data[0].isspace():
+            # Lanjutan kata yang dipotong markup inline, mis. "<b>10GB</b>," -> "10GB,"
+            self._append_to_last_word(words.pop(0))
+        self.separated = data[-1].isspace()
+        for word in words:
+            self._add_word(word)
+
+    def _add_word(self, word):
+        if self.words and self.line_len + 1 + len(word) > self.width:
+            self._break_line()
+        self.line_len += len(word) + (1 if self.words else 0)
+        self.words.append(word)
+
+    def _append_to_last_word(self, part):
+        last = self.words.pop()
+        self.line_len -= len(last) + (1 if self.words else 0)
+        self._add_word(last + part)
 
     def get_text(self):
-        # Join and clean multiple newlines
-        text = "".join(self.result)
-        text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
-        # Wrap lines nicely
-        return "\n".join(textwrap.wrap(text, width=self.width, replace_whitespace=False))
+        self._break_line()
+        while self.lines and self.lines[-1] == "":
+            self.lines.pop()
+        return "\n".join(self.lines)
 
 
 def display_html(html_text, width=100):
-    parser = HTMLToText(width=width)
-    parser.feed(html_text)
-    return parser.get_text()
+    # TnC yang sama tidak di-parse ulang tiap kali layar paket digambar
+    key = (hashlib.sha1(html_text.encode("utf-8")).hexdigest(), width)
+    text = html_text_cache.get(key)
+    if text is None:
+        parser = HTMLToText(width=width)
+        parser.feed(html_text)
+        parser.close()
+        text = parser.get_text()
+        html_text_cache.set(key, text)
+    return text
 
 
 # -----------------------------